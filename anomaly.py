@@ -0,0 +1,167 @@
+import time
+import numpy as np
+
+
+class AnomalyDetector:
+    """Rolling-statistics anomaly detector for many metric series.
+
+    Every series keeps an EWMA mean and variance plus a slower seasonal
+    baseline (one slot per `season_length` seconds, `seasons` slots per
+    cycle; hour-of-day by default). Samples within a slot are accumulated
+    into that visit's mean and variance, and each visit is folded into the
+    slot's baseline once when the slot closes, so the baseline follows
+    previous cycles rather than the tail of the last one. Updates are O(1)
+    per series and applied to all series of a tick at once with numpy, so
+    no history is stored.
+    """
+
+    def __init__(self, alpha=0.1, season_alpha=0.3, threshold=4.0, warmup=30, season_warmup=3,
+                 seasons=24, season_length=3600, min_std=1.0, expire=600, capacity=256):
+        self.alpha = alpha
+        self.season_alpha = season_alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.season_warmup = season_warmup
+        self.seasons = seasons
+        self.season_length = season_length
+        self.min_std = min_std
+        self.expire = expire
+
+        self.index = {}  # series name -> row
+        self.names = []
+        self.mean = np.zeros(capacity)
+        self.var = np.zeros(capacity)
+        self.count = np.zeros(capacity, dtype=np.int64)
+        self.last_seen = np.zeros(capacity)
+        self.season_mean = np.zeros((capacity, seasons))
+        self.season_var = np.zeros((capacity, seasons))
+        self.season_count = np.zeros((capacity, seasons), dtype=np.int64)
+
+        # Running (Welford) statistics of the current slot visit per series
+        self.visit_slot = np.full(capacity, -1, dtype=np.int64)
+        self.visit_mean = np.zeros(capacity)
+        self.visit_m2 = np.zeros(capacity)
+        self.visit_count = np.zeros(capacity, dtype=np.int64)
+
+    def _grow(self):
+        """Double the capacity of all state arrays"""
+        capacity = len(self.mean)
+        for attr in ('mean', 'var', 'count', 'last_seen', 'season_mean', 'season_var', 'season_count',
+                     'visit_slot', 'visit_mean', 'visit_m2', 'visit_count'):
+            old = getattr(self, attr)
+            new = np.zeros((capacity * 2,) + old.shape[1:], dtype=old.dtype)
+            if attr == 'visit_slot':
+                new[:] = -1
+            new[:capacity] = old
+            setattr(self, attr, new)
+
+    def _reset_row(self, row):
+        """Clear the state of a row before (re)using it"""
+        self.mean[row] = self.var[row] = self.last_seen[row] = 0
+        self.count[row] = 0
+        self.season_mean[row] = self.season_var[row] = 0
+        self.season_count[row] = 0
+        self.visit_slot[row] = -1
+        self.visit_mean[row] = self.visit_m2[row] = 0
+        self.visit_count[row] = 0
+
+    def _close_visits(self, rows, absolute_slot):
+        """Fold finished slot visits of `rows` into their seasonal baselines"""
+        closing = rows[(self.visit_slot[rows] != absolute_slot) & (self.visit_count[rows] >= self.warmup)]
+        if len(closing):
+            slots = self.visit_slot[closing] % self.seasons
+            visit_mean = self.visit_mean[closing]
+            visit_var = self.visit_m2[closing] / self.visit_count[closing]
+
+            # First visit seeds the slot; later ones are blended in with season_alpha
+            first = self.season_count[closing, slots] == 0
+            self.season_mean[closing[first], slots[first]] = visit_mean[first]
+            self.season_var[closing[first], slots[first]] = visit_var[first]
+            a = np.where(first, 0.0, self.season_alpha)
+            diff = visit_mean - self.season_mean[closing, slots]
+            self.season_mean[closing, slots] += a * diff
+            self.season_var[closing, slots] = (1 - a) * (self.season_var[closing, slots] + a * diff * diff) \
+                + a * visit_var
+            self.season_count[closing, slots] += 1
+
+        # Start a new visit for every row that moved to another slot
+        moved = rows[self.visit_slot[rows] != absolute_slot]
+        self.visit_slot[moved] = absolute_slot
+        self.visit_mean[moved] = self.visit_m2[moved] = 0
+        self.visit_count[moved] = 0
+
+    def _row(self, name, now):
+        """Get the row for a series, reusing expired rows before growing"""
+        row = self.index.get(name)
+        if row is not None:
+            self.last_seen[row] = now
+            return row
+
+        if len(self.names) < len(self.mean):
+            row = len(self.names)
+            self.names.append(name)
+        else:
+            idle = now - self.last_seen[:len(self.names)]
+            row = int(np.argmax(idle))
+            if idle[row] > self.expire:
+                del self.index[self.names[row]]
+                self.names[row] = name
+            else:
+                self._grow()
+                row = len(self.names)
+                self.names.append(name)
+
+        self._reset_row(row)
+        self.last_seen[row] = now
+        self.index[name] = row
+        return row
+
+    def update(self, samples, timestamp=None):
+        """Feed one tick of {series: value} samples.
+
+        Returns {series: {'value', 'expected', 'score'}} for the series whose
+        value deviates from its baseline by more than `threshold` std devs.
+        Each sample is scored against the baseline before it is absorbed.
+        """
+        if not samples:
+            return {}
+
+        now = timestamp if timestamp is not None else time.time()
+        absolute_slot = int(now // self.season_length)
+        slot = absolute_slot % self.seasons
+        rows = np.fromiter((self._row(name, now) for name in samples), dtype=np.int64, count=len(samples))
+        values = np.fromiter(samples.values(), dtype=np.float64, count=len(samples))
+        self._close_visits(rows, absolute_slot)
+
+        # Prefer the seasonal baseline once it has seen enough previous visits
+        seasonal = self.season_count[rows, slot] >= self.season_warmup
+        expected = np.where(seasonal, self.season_mean[rows, slot], self.mean[rows])
+        var = np.where(seasonal, self.season_var[rows, slot], self.var[rows])
+        std = np.maximum(np.sqrt(var), np.maximum(np.abs(expected) * 0.05, self.min_std))
+        score = (values - expected) / std
+        flagged = (self.count[rows] >= self.warmup) & (np.abs(score) > self.threshold)
+
+        # EWMA mean/variance: var' = (1 - a) * (var + a * diff^2)
+        first = self.count[rows] == 0
+        self.mean[rows[first]] = values[first]
+        diff = values - self.mean[rows]
+        increment = self.alpha * diff
+        self.mean[rows] += increment
+        self.var[rows] = (1 - self.alpha) * (self.var[rows] + diff * increment)
+        self.count[rows] += 1
+
+        # Accumulate the current slot visit; it reaches the baseline when the slot closes
+        self.visit_count[rows] += 1
+        diff = values - self.visit_mean[rows]
+        self.visit_mean[rows] += diff / self.visit_count[rows]
+        self.visit_m2[rows] += diff * (values - self.visit_mean[rows])
+
+        anomalies = {}
+        names = list(samples.keys())
+        for i in np.flatnonzero(flagged):
+            anomalies[names[i]] = {
+                'value': float(values[i]),
+                'expected': float(expected[i]),
+                'score': float(score[i])
+            }
+        return anomalies
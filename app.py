@@ -1,16 +1,22 @@
+import argparse
 import tkinter as tk
 from backend import SystemMonitor
 from frontend import SystemMonitorUI
 
 def main():
     """System Monitor Application with Separate Tabs"""
+    parser = argparse.ArgumentParser(description="System Resource Monitor")
+    parser.add_argument('--worker-process', action='store_true',
+                        help="collect metrics in a separate process so slow psutil calls never stall the UI")
+    args = parser.parse_args()
+    
     print("Starting System Monitor with Separate Tabs...")
     
     # Create root window
     root = tk.Tk()
     
     # Create backend
-    backend = SystemMonitor(update_interval=1.0)
+    backend = SystemMonitor(update_interval=1.0, use_worker_process=args.worker_process)
     
     # Create frontend
     frontend = SystemMonitorUI(root, backend)
@@ -31,7 +37,7 @@ def main():
     print("3. Disk - Disk usage and I/O")
     print("4. Network - Network interfaces and activity")
     print("5. Processes - Running processes management")
-    print("6. Commands - System commands execution")
+    print("6. Commands - System commands and diagnostic bundles")
     
     print("\nAvailable Commands:")
     for i, cmd in enumerate(backend.get_commands(), 1):
@@ -1,25 +1,59 @@
 import psutil
 import platform
+import asyncio
 import threading
 import time
-import subprocess
+import multiprocessing
 import queue
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from commands import CommandCatalog
+from process_actions import ProcessActions
+from process_registry import ProcessFilter, ProcessRegistry, collect_processes
+from engine import CollectionEngine
+from anomaly import AnomalyDetector
+from history import HistoryStore
+import procfs
 
 class SystemMonitor:
-    def __init__(self, update_interval=1.0):
+    def __init__(self, update_interval=1.0, commands_file=None, use_worker_process=False):
         # Data storage for charts
         self.cpu_history = [0] * 30
         self.memory_history = [0] * 30
         self.disk_history = [0] * 30
         self.network_history = [0] * 30
         
-        # Previous values for rate calculations
-        self.prev_disk_read = 0
-        self.prev_disk_write = 0
-        self.prev_net_sent = 0
-        self.prev_net_recv = 0
-        self.prev_time = time.time()
+        # Static CPU topology, read once
+        self.cpu_topology = self.get_cpu_topology()
+        
+        # Long-range history: raw samples rolled up into 1-minute and 1-hour tiers
+        self.history = HistoryStore()
+        
+        # Anomaly detection on the metric stream, recent events kept for chart markers
+        self.anomaly_detector = AnomalyDetector()
+        self.anomaly_events = {name: deque(maxlen=1000) for name in ('cpu', 'memory', 'disk', 'network')}
+        self.latest_processes = []
+        self.process_interval = 5.0
+        
+        # Full process table indexed for filtering; only matching rows are sent to the GUI
+        self.process_registry = ProcessRegistry()
+        self.process_filter = ProcessFilter()
+        self.process_filter_spec = {}
+        self.process_limit = 100
+        # While a filter limits measuring, still measure everything every few scans
+        self.full_process_scan_every = 6
+        self.process_scans = 0
+        
+        # Previous values for rate calculations, with each collector's last timestamp
+        self.prev_cpu = None
+        self.cpu_baseline = False
+        self.prev_memory = None
+        self.prev_disk = None
+        self.prev_network = None
+        self.prev_times = {}
+        self.latest = {}
         
         # Thread-safe queues
         self.update_queue = queue.Queue() # stores system resource data
@@ -29,48 +63,169 @@ class SystemMonitor:
         self.update_interval = update_interval
         self.running = True
         self.update_thread = None
+        self.engine = None
         
-        self.commands = {
-            'Ping': ['ping', '-n', '4', 'google.com'],
-            'IP Config': ['ipconfig'],
-            'Task List': ['tasklist'],
-            'System Info': ['systeminfo'],
-            'Hostname': ['hostname'],
-            'Echo Hello': ['echo', 'hello']
-        }
+        # Optional collector process so psutil work never competes with the GUI
+        self.use_worker_process = use_worker_process
+        self.worker = None
+        self.worker_conn = None
+        self.worker_started = 0
+        self.worker_restarts = 0
+        self.worker_failures = 0  # consecutive restarts without a sample in between
+        self.max_worker_failures = 5
+        self.next_worker_start = 0
+        self.worker_error = None
+        self.last_sample_time = None
+        
+        # Commands run off the collection thread so slow ones don't stall updates
+        self.command_catalog = CommandCatalog(commands_file)
+        self.command_executor = None
+        
+        # Batch process actions get their own executor so slow commands never delay them
+        self.process_actions = ProcessActions()
+        self.action_executor = None
     
     def start(self):
         """Start monitoring"""
         self.running = True
+        self.command_executor = ThreadPoolExecutor(max_workers=2)
+        self.action_executor = ThreadPoolExecutor(max_workers=2)
+        if self.use_worker_process:
+            self.start_worker()
         self.update_thread = threading.Thread(target=self.update_data, daemon=True)
         self.update_thread.start()
     
     def stop(self):
         """Stop monitoring"""
         self.running = False
+        if self.engine:
+            self.engine.stop()
+        if self.command_executor:
+            self.command_executor.shutdown(wait=False, cancel_futures=True)
+        if self.action_executor:
+            self.action_executor.shutdown(wait=False, cancel_futures=True)
         if self.update_thread and self.update_thread.is_alive():
             self.update_thread.join(timeout=1.0)
+        self.stop_worker()
+    
+    def get_cpu_topology(self):
+        """Get static CPU topology (sockets, cores, SMT siblings, NUMA)"""
+        topology = procfs.read_cpu_topology()
+        try:
+            logical = psutil.cpu_count(logical=True) or 1
+            physical = psutil.cpu_count(logical=False) or logical
+        except:
+            logical = physical = 1
+        return {
+            'cpu_count': logical,
+            'physical_cores': topology.get('cores', physical),
+            'sockets': topology.get('sockets', 1),
+            'smt_siblings': topology.get('smt_siblings', []),
+            'numa': topology.get('numa', {})
+        }
     
     def get_cpu_info(self):
         """Get CPU information"""
+        topology = self.cpu_topology
+        info = {
+            'cpu_count': topology['cpu_count'],
+            'physical_cores': topology['physical_cores'],
+            'sockets': topology['sockets']
+        }
+        
+        # Utilization since the previous call; interval=None never blocks. psutil keeps
+        # that baseline per thread, so the first call sets it over a short interval
+        if not self.cpu_baseline:
+            try:
+                psutil.cpu_percent(interval=None)
+                psutil.cpu_percent(interval=None, percpu=True)
+                psutil.cpu_times_percent(interval=None)
+                time.sleep(0.1)
+            except:
+                pass
+            self.cpu_baseline = True
+        try:
+            info['cpu_percent'] = psutil.cpu_percent(interval=None)
+            info['per_cpu'] = psutil.cpu_percent(interval=None, percpu=True)
+        except:
+            info['cpu_percent'] = 0
+            info['per_cpu'] = [0] * topology['cpu_count']
+        
+        # Frequency, overall and per core
         try:
             cpu_freq = psutil.cpu_freq()
-            return {
-                'cpu_count': psutil.cpu_count(logical=True),
-                'physical_cores': psutil.cpu_count(logical=False),
-                'current_freq': cpu_freq.current if cpu_freq else 0,
-                'max_freq': cpu_freq.max if cpu_freq else 0,
-                'cpu_percent': psutil.cpu_percent(interval=0.1),
-                'per_cpu': psutil.cpu_percent(interval=0.1, percpu=True)
+            info['current_freq'] = cpu_freq.current if cpu_freq else 0
+            info['max_freq'] = cpu_freq.max if cpu_freq else 0
+            info['per_cpu_freq'] = [f.current for f in psutil.cpu_freq(percpu=True) or []]
+        except:
+            info['current_freq'] = info['max_freq'] = 0
+            info['per_cpu_freq'] = []
+        
+        # Time breakdown; steal and iowait only exist on some platforms
+        try:
+            times = psutil.cpu_times_percent(interval=None)
+            info['times'] = {
+                'user': times.user,
+                'system': times.system,
+                'iowait': getattr(times, 'iowait', 0),
+                'steal': getattr(times, 'steal', 0)
             }
         except:
-            return {'cpu_count': 1, 'physical_cores': 1, 'current_freq': 0, 'max_freq': 0, 'cpu_percent': 0, 'per_cpu': [0]}
+            info['times'] = {'user': 0, 'system': 0, 'iowait': 0, 'steal': 0}
+        
+        # Cumulative context switches and interrupts
+        try:
+            stats = psutil.cpu_stats()
+            info['ctx_switches'] = stats.ctx_switches
+            info['interrupts'] = stats.interrupts
+        except:
+            info['ctx_switches'] = info['interrupts'] = 0
+        
+        try:
+            info['load_avg'] = psutil.getloadavg()
+        except:
+            info['load_avg'] = (0, 0, 0)
+        
+        pressure = procfs.read_pressure('cpu')
+        info['pressure'] = {
+            'some': pressure.get('some', {}).get('avg10', 0),
+            'full': pressure.get('full', {}).get('avg10', 0)
+        }
+        
+        return info
+    
+    def cpu_rates(self, cpu_info, time_diff):
+        """Context switch and interrupt rates (/s) since the last tick"""
+        rates = {'ctx_switches': 0, 'interrupts': 0}
+        
+        if time_diff > 0 and self.prev_cpu:
+            for key in rates:
+                rates[key] = max(cpu_info[key] - self.prev_cpu[key], 0) / time_diff
+        self.prev_cpu = cpu_info
+        
+        return rates
+    
+    def cpu_series(self, cpu_info):
+        """Flatten the CPU breakdown into history series"""
+        per_cpu_freq = cpu_info['per_cpu_freq']
+        return {
+            'load1': cpu_info['load_avg'][0],
+            'load5': cpu_info['load_avg'][1],
+            'load15': cpu_info['load_avg'][2],
+            'cpu_pressure_some': cpu_info['pressure']['some'],
+            'cpu_pressure_full': cpu_info['pressure']['full'],
+            'iowait': cpu_info['times']['iowait'],
+            'steal': cpu_info['times']['steal'],
+            'ctx_switches': cpu_info['rates']['ctx_switches'],
+            'interrupts': cpu_info['rates']['interrupts'],
+            'cpu_freq': sum(per_cpu_freq) / len(per_cpu_freq) if per_cpu_freq else cpu_info['current_freq']
+        }
     
     def get_memory_info(self):
         """Get memory information"""
         try:
             memory = psutil.virtual_memory()
-            return {
+            info = {
                 'total': memory.total,
                 'available': memory.available,
                 'used': memory.used,
@@ -80,7 +235,77 @@ class SystemMonitor:
                 'used_gb': memory.used / (1024**3)
             }
         except:
-            return {'total': 0, 'available': 0, 'used': 0, 'percent': 0, 'total_gb': 0, 'available_gb': 0, 'used_gb': 0}
+            info = {'total': 0, 'available': 0, 'used': 0, 'percent': 0, 'total_gb': 0, 'available_gb': 0, 'used_gb': 0}
+        
+        # Swap usage; sin/sout are cumulative bytes swapped in/out
+        try:
+            swap = psutil.swap_memory()
+            info['swap'] = {
+                'total': swap.total,
+                'used': swap.used,
+                'percent': swap.percent,
+                'sin': swap.sin,
+                'sout': swap.sout
+            }
+        except:
+            info['swap'] = {'total': 0, 'used': 0, 'percent': 0, 'sin': 0, 'sout': 0}
+        
+        # Page cache breakdown (Linux)
+        meminfo = procfs.read_meminfo()
+        info['cache'] = {
+            'cached': meminfo.get('Cached', 0),
+            'buffers': meminfo.get('Buffers', 0),
+            'dirty': meminfo.get('Dirty', 0),
+            'writeback': meminfo.get('Writeback', 0)
+        }
+        
+        # PSI memory pressure and major page faults (Linux)
+        pressure = procfs.read_pressure('memory')
+        info['pressure'] = {
+            'some': pressure.get('some', {}).get('avg10', 0),
+            'full': pressure.get('full', {}).get('avg10', 0)
+        }
+        info['major_faults'] = procfs.read_vmstat().get('pgmajfault', 0)
+        info['numa'] = procfs.read_numa_meminfo()
+        
+        return info
+    
+    def memory_series(self, memory_info):
+        """Flatten the memory breakdown into history series"""
+        cache = memory_info['cache']
+        series = {
+            'swap': memory_info['swap']['percent'],
+            'swap_in': memory_info['rates']['swap_in'],
+            'swap_out': memory_info['rates']['swap_out'],
+            'cached': cache['cached'] / (1024**2),
+            'buffers': cache['buffers'] / (1024**2),
+            'dirty': cache['dirty'] / (1024**2),
+            'writeback': cache['writeback'] / (1024**2),
+            'memory_pressure_some': memory_info['pressure']['some'],
+            'memory_pressure_full': memory_info['pressure']['full'],
+            'major_faults': memory_info['rates']['major_faults']
+        }
+        for node, usage in memory_info['numa'].items():
+            series[f'numa:{node}'] = usage['percent']
+        return series
+    
+    def get_numa_nodes(self):
+        """Get NUMA node ids"""
+        return procfs.numa_nodes()
+    
+    def memory_rates(self, memory_info, time_diff):
+        """Swap-in/out (MB/s) and major page fault (/s) rates since the last tick"""
+        swap = memory_info['swap']
+        rates = {'swap_in': 0, 'swap_out': 0, 'major_faults': 0}
+        
+        if time_diff > 0 and self.prev_memory:
+            prev_swap = self.prev_memory['swap']
+            rates['swap_in'] = max(swap['sin'] - prev_swap['sin'], 0) / time_diff / (1024**2)
+            rates['swap_out'] = max(swap['sout'] - prev_swap['sout'], 0) / time_diff / (1024**2)
+            rates['major_faults'] = max(memory_info['major_faults'] - self.prev_memory['major_faults'], 0) / time_diff
+        self.prev_memory = memory_info
+        
+        return rates
     
     def get_disk_info(self):
         """Get disk information"""
@@ -118,7 +343,15 @@ class SystemMonitor:
         except:
             io_info = {'read_bytes': 0, 'write_bytes': 0, 'read_count': 0, 'write_count': 0}
         
-        return {'partitions': disks, 'io': io_info}
+        # Per-disk I/O counters
+        per_disk = {}
+        try:
+            for name, counters in (psutil.disk_io_counters(perdisk=True) or {}).items():
+                per_disk[name] = {'read_bytes': counters.read_bytes, 'write_bytes': counters.write_bytes}
+        except:
+            pass
+        
+        return {'partitions': disks, 'io': io_info, 'per_disk': per_disk}
     
     def get_network_info(self):
         """Get network information"""
@@ -132,6 +365,11 @@ class SystemMonitor:
                 'packets_recv': net_io.packets_recv if net_io else 0
             }
             
+            # Per-NIC I/O counters
+            per_nic = {}
+            for name, counters in psutil.net_io_counters(pernic=True).items():
+                per_nic[name] = {'bytes_sent': counters.bytes_sent, 'bytes_recv': counters.bytes_recv}
+            
             # Network interfaces
             interfaces = []
             for interface, addrs in psutil.net_if_addrs().items():
@@ -151,51 +389,36 @@ class SystemMonitor:
                     'speed': stats.speed if stats else 0
                 })
             
-            return {'io': io_info, 'interfaces': interfaces}
+            return {'io': io_info, 'interfaces': interfaces, 'per_nic': per_nic}
         except:
-            return {'io': {'bytes_sent': 0, 'bytes_recv': 0, 'packets_sent': 0, 'packets_recv': 0}, 'interfaces': []}
+            return {'io': {'bytes_sent': 0, 'bytes_recv': 0, 'packets_sent': 0, 'packets_recv': 0}, 'interfaces': [], 'per_nic': {}}
     
     def get_processes(self):
-        """Get process information"""
-        processes = []
+        """Get process information for every process into the registry"""
+        full_scan = self.process_scans % self.full_process_scan_every == 0
+        self.process_scans += 1
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'status']):
-                try:
-                    pinfo = proc.info
-                    processes.append({
-                        'pid': pinfo['pid'],
-                        'name': pinfo['name'][:40],
-                        'cpu_percent': pinfo['cpu_percent'] or 0,
-                        'memory_percent': pinfo['memory_percent'] or 0,
-                        'status': pinfo['status']
-                    })
-                except:
-                    pass
+            rows = collect_processes(self.process_registry, None if full_scan else self.process_filter)
         except:
-            pass
-        return sorted(processes, key=lambda x: x['cpu_percent'], reverse=True)[:100]
+            rows = []
+        self.process_registry.update(rows, time.time())
+        return rows
     
-    def execute_command(self, command_name):
+    def execute_command(self, command_name, params=None):
         """Execute a command"""
-        if command_name not in self.commands:
-            return {'success': False, 'output': 'Command not found'}
-        
+        return self.command_catalog.run(command_name, params)
+    
+    def run_bundle(self, bundle_name, params=None):
+        """Run a diagnostic bundle concurrently"""
+        return self.command_catalog.run_bundle(bundle_name, params)
+    
+    def _run_command_job(self, result_type, func, *args):
+        """Run a command job and queue its result for the GUI"""
         try:
-            cmd = self.commands[command_name]
-            
-            # Set timeout based on command type
-            timeout = 30 if command_name == 'System Info' else 15
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, shell=True)
-            
-            if result.returncode == 0:
-                return {'success': True, 'output': result.stdout}
-            else:
-                return {'success': False, 'output': result.stderr or 'Command failed'}
-        except subprocess.TimeoutExpired:
-            return {'success': False, 'output': f'Command timeout ({timeout} seconds)'}
+            result = func(*args)
         except Exception as e:
-            return {'success': False, 'output': f'Error: {str(e)}'}
+            result = {'success': False, 'output': f'Error: {str(e)}'}
+        self.command_result_queue.put((result_type, result))
     
     def kill_process(self, pid):
         """Kill a process"""
@@ -210,83 +433,352 @@ class SystemMonitor:
         except Exception as e:
             return {'success': False, 'message': str(e)}
     
+    def process_action(self, action, selector, value=None, timeout=None):
+        """Apply an action to every process matching `selector` in parallel"""
+        return self.process_actions.run(action, selector, value, timeout)
+    
+    def preview_process_action(self, selector, limit=20):
+        """Dry run a selector: matching PIDs and the first rows to show for confirmation"""
+        return self.process_actions.preview(selector, limit)
+    
+    def detect_anomalies(self, sample):
+        """Feed the current sample to the anomaly detector"""
+        series = {
+            'cpu': sample['cpu']['cpu_percent'],
+            'memory': sample['memory']['percent'],
+            'disk': sample['disk_rate'],
+            'network': sample['network_rate']
+        }
+        for name, rate in sample['disk']['per_disk_rates'].items():
+            series[f'disk:{name}'] = rate
+        for name, rate in sample['network']['per_nic_rates'].items():
+            series[f'net:{name}'] = rate
+        
+        # Top processes by CPU, only from scans that measured every process; rows skipped
+        # by a filter carry stale numbers that would hide new runaways
+        fresh = 'processes' in sample and self.process_registry.complete
+        top = self.process_registry.query(limit=10)[1] if fresh else []
+        for proc in top:
+            key = f"proc:{proc['name']}"
+            series[key] = series.get(key, 0) + proc['cpu_percent']
+        
+        anomalies = self.anomaly_detector.update(series, sample['timestamp'])
+        
+        for name, events in self.anomaly_events.items():
+            if name in anomalies:
+                events.append((sample['timestamp'], anomalies[name]['value']))
+        
+        return anomalies
+    
+    def disk_rates(self, disk_info, time_diff):
+        """Aggregate (MB/s) and per-disk (MB/s) throughput since the last sample"""
+        rate = 0
+        per_disk = {}
+        
+        if time_diff > 0 and self.prev_disk:
+            read_rate = (disk_info['io']['read_bytes'] - self.prev_disk['io']['read_bytes']) / time_diff / (1024**2)
+            write_rate = (disk_info['io']['write_bytes'] - self.prev_disk['io']['write_bytes']) / time_diff / (1024**2)
+            rate = read_rate + write_rate
+            
+            for name, io in disk_info['per_disk'].items():
+                prev = self.prev_disk['per_disk'].get(name)
+                if prev:
+                    total = io['read_bytes'] + io['write_bytes'] - prev['read_bytes'] - prev['write_bytes']
+                    per_disk[name] = total / time_diff / (1024**2)
+        self.prev_disk = disk_info
+        
+        return rate, per_disk
+    
+    def network_rates(self, network_info, time_diff):
+        """Aggregate (KB/s) and per-NIC (KB/s) throughput since the last sample"""
+        rate = 0
+        per_nic = {}
+        
+        if time_diff > 0 and self.prev_network:
+            sent_rate = (network_info['io']['bytes_sent'] - self.prev_network['io']['bytes_sent']) / time_diff / 1024
+            recv_rate = (network_info['io']['bytes_recv'] - self.prev_network['io']['bytes_recv']) / time_diff / 1024
+            rate = sent_rate + recv_rate
+            
+            for name, io in network_info['per_nic'].items():
+                prev = self.prev_network['per_nic'].get(name)
+                if prev:
+                    total = io['bytes_sent'] + io['bytes_recv'] - prev['bytes_sent'] - prev['bytes_recv']
+                    per_nic[name] = total / time_diff / 1024
+        self.prev_network = network_info
+        
+        return rate, per_nic
+    
+    def enrich(self, name, info, timestamp):
+        """Add rates to a fresh collector result using that collector's own timestamps"""
+        time_diff = timestamp - self.prev_times.get(name, timestamp)
+        self.prev_times[name] = timestamp
+        
+        if name == 'cpu':
+            info['rates'] = self.cpu_rates(info, time_diff)
+        elif name == 'memory':
+            info['rates'] = self.memory_rates(info, time_diff)
+        elif name == 'disk':
+            info['rate'], info['per_disk_rates'] = self.disk_rates(info, time_diff)
+        elif name == 'network':
+            info['rate'], info['per_nic_rates'] = self.network_rates(info, time_diff)
+        return info
+    
+    def create_engine(self):
+        """Build the collection engine; each collector runs concurrently with its own deadline"""
+        engine = CollectionEngine(self.update_interval)
+        engine.add('cpu', self.get_cpu_info)
+        engine.add('memory', self.get_memory_info)
+        engine.add('disk', self.get_disk_info)
+        engine.add('network', self.get_network_info)
+        engine.add('processes', self.get_processes, period=self.process_interval)
+        return engine
+    
+    def build_sample(self, tick_time, results):
+        """Assemble a sample from engine results, or None until every core collector has reported"""
+        for name, result in results.items():
+            if result['fresh'] and name != 'processes':
+                self.latest[name] = self.enrich(name, result['value'], result['timestamp'])
+        
+        if not all(name in self.latest for name in ('cpu', 'memory', 'disk', 'network')):
+            return None
+        
+        # Measured time of the freshest core readings; each collector's own time is kept too
+        collected_at = {name: result['timestamp'] for name, result in results.items()}
+        fresh_times = sorted(result['timestamp'] for name, result in results.items()
+                             if result['fresh'] and name != 'processes')
+        
+        sample = {
+            'timestamp': fresh_times[len(fresh_times) // 2] if fresh_times else tick_time,
+            'tick': tick_time,
+            'collected_at': collected_at,
+            'cpu': self.latest['cpu'],
+            'memory': self.latest['memory'],
+            'disk': self.latest['disk'],
+            'network': self.latest['network'],
+            'disk_rate': self.latest['disk']['rate'],
+            'network_rate': self.latest['network']['rate']
+        }
+        if 'processes' in results and results['processes']['fresh']:
+            sample['processes'] = results['processes']['value']
+        
+        return sample
+    
+    def sample_series(self, sample):
+        """Flatten a sample into the {series: value} metrics kept in history"""
+        series = {
+            'cpu': sample['cpu']['cpu_percent'],
+            'memory': sample['memory']['percent'],
+            'disk': sample['disk_rate'],
+            'network': sample['network_rate']
+        }
+        series.update(self.cpu_series(sample['cpu']))
+        series.update(self.memory_series(sample['memory']))
+        return series
+    
+    def record_sample(self, sample):
+        """Update histories and anomaly detection, then publish the sample to the GUI"""
+        current_time = sample['timestamp']
+        cpu_info = sample['cpu']
+        memory_info = sample['memory']
+        
+        # Update history
+        self.cpu_history.append(cpu_info['cpu_percent'])
+        self.cpu_history.pop(0)
+        self.memory_history.append(memory_info['percent'])
+        self.memory_history.pop(0)
+        self.disk_history.append(min(sample['disk_rate'], 100))  
+        self.disk_history.pop(0)
+        self.network_history.append(min(sample['network_rate'], 1000))  
+        self.network_history.pop(0)
+        self.history.record(current_time, self.sample_series(sample))
+        
+        if 'processes' in sample and self.use_worker_process:
+            self.process_registry.update(sample['processes'], sample['collected_at'].get('processes'))
+        sample['anomalies'] = self.detect_anomalies(sample)
+        if 'processes' in sample:
+            sample['processes'], sample['process_count'], sample['process_total'] = self.query_processes()
+        
+        self.last_sample_time = current_time
+        
+        # Put data in queue
+        sample.update({
+            'cpu_history': self.cpu_history.copy(),
+            'memory_history': self.memory_history.copy(),
+            'disk_history': self.disk_history.copy(),
+            'network_history': self.network_history.copy()
+        })
+        self.update_queue.put(sample)
+    
+    def process_commands(self):
+        """Dispatch every queued command; slow ones run on executors"""
+        while True:
+            try:
+                command_type, data = self.command_queue.get_nowait()
+            except queue.Empty:
+                return
+            
+            if command_type == 'execute':
+                self.command_executor.submit(self._run_command_job, 'command_result',
+                                             self.execute_command, data)
+            elif command_type == 'bundle':
+                self.command_executor.submit(self._run_command_job, 'bundle_result',
+                                             self.run_bundle, data)
+            elif command_type == 'kill_process':
+                result = self.kill_process(data)
+                self.command_result_queue.put(('kill_result', result))
+            elif command_type == 'process_action':
+                self.action_executor.submit(self._run_command_job, 'process_action_result',
+                                            self.process_action, data['action'], data['selector'],
+                                            data.get('value'), data.get('timeout'))
+            elif command_type == 'process_filter':
+                # The collector uses the filter to skip measuring non-matching processes
+                if self.worker:
+                    self.worker_conn.send(('process_filter', data))
+            elif command_type == 'refresh_processes':
+                if self.worker:
+                    self.worker_conn.send('refresh_processes')
+                elif self.engine:
+                    self.engine.request('processes')
+    
+    def start_worker(self):
+        """Start the collector process"""
+        # Spawn rather than fork: restarts happen on the collector thread while GUI and executor threads run
+        context = multiprocessing.get_context('spawn')
+        parent_conn, child_conn = context.Pipe()
+        self.worker = context.Process(target=run_collector_worker, daemon=True,
+                                      args=(child_conn, self.update_interval, self.process_interval,
+                                            self.process_filter_spec))
+        self.worker.start()
+        child_conn.close()
+        self.worker_conn = parent_conn
+        self.worker_started = time.time()
+    
+    def stop_worker(self):
+        """Stop the collector process"""
+        if self.worker is None:
+            return
+        if self.worker.is_alive():
+            self.worker.terminate()
+        self.worker.join(timeout=1.0)
+        self.worker_conn.close()
+        self.worker = None
+    
+    def restart_worker(self):
+        """Replace a crashed or hung collector process after an exponential backoff.
+        
+        Gives up after `max_worker_failures` consecutive failures; the
+        reason is reported through get_collector_status().
+        """
+        self.stop_worker()
+        if not self.running:
+            return
+        self.worker_failures += 1
+        if self.worker_failures > self.max_worker_failures:
+            self.worker_error = f"collector process failed {self.max_worker_failures} times in a row, stopped"
+            print(f"Collector process failed {self.max_worker_failures} times in a row, giving up")
+            return
+        delay = min(2 ** (self.worker_failures - 1), 30)
+        print(f"Collector process stopped responding, restarting in {delay}s")
+        self.next_worker_start = time.time() + delay
+    
+    def receive_from_worker(self):
+        """Record samples from the collector process, restarting it if it dies or hangs"""
+        if self.worker is None:
+            # Waiting out the restart backoff, or given up
+            if self.worker_error is None and time.time() >= self.next_worker_start:
+                self.worker_restarts += 1
+                self.start_worker()
+            else:
+                time.sleep(min(self.update_interval, 0.5))
+            return
+        
+        last = max(self.last_sample_time or 0, self.worker_started)
+        hung = time.time() - last > max(10 * self.update_interval, 10)
+        if not self.worker.is_alive() or hung:
+            self.restart_worker()
+            return
+        
+        try:
+            if self.worker_conn.poll(min(self.update_interval, 0.5)):
+                self.record_sample(self.worker_conn.recv())
+                self.worker_failures = 0
+        except (EOFError, OSError):
+            self.restart_worker()
+    
+    def on_engine_tick(self, tick_time, results):
+        """Record an engine tick and dispatch queued commands"""
+        if not self.running:
+            self.engine.stop()
+            return
+        try:
+            sample = self.build_sample(tick_time, results)
+            if sample:
+                self.record_sample(sample)
+            self.process_commands()
+        except Exception as e:
+            print(f"Error in update: {e}")
+    
     def update_data(self):
         """Background data collection"""
+        if not self.worker:
+            self.engine = self.create_engine()
+            asyncio.run(self.engine.run(self.on_engine_tick))
+            return
+        
         while self.running:
             try:
-                current_time = time.time()
-                time_diff = current_time - self.prev_time
-                
-                # Get all system data
-                cpu_info = self.get_cpu_info()
-                memory_info = self.get_memory_info()
-                disk_info = self.get_disk_info()
-                network_info = self.get_network_info()
-                
-                # Calculate rates
-                disk_rate = 0
-                network_rate = 0
-                
-                if time_diff > 0:
-                    # Disk rate (MB/s)
-                    disk_read_rate = (disk_info['io']['read_bytes'] - self.prev_disk_read) / time_diff / (1024**2)
-                    disk_write_rate = (disk_info['io']['write_bytes'] - self.prev_disk_write) / time_diff / (1024**2)
-                    disk_rate = disk_read_rate + disk_write_rate
-                    
-                    # Network rate (KB/s)
-                    net_sent_rate = (network_info['io']['bytes_sent'] - self.prev_net_sent) / time_diff / 1024
-                    net_recv_rate = (network_info['io']['bytes_recv'] - self.prev_net_recv) / time_diff / 1024
-                    network_rate = net_sent_rate + net_recv_rate
-                    
-                    self.prev_disk_read = disk_info['io']['read_bytes']
-                    self.prev_disk_write = disk_info['io']['write_bytes']
-                    self.prev_net_sent = network_info['io']['bytes_sent']
-                    self.prev_net_recv = network_info['io']['bytes_recv']
-                
-                # Update history
-                self.cpu_history.append(cpu_info['cpu_percent'])
-                self.cpu_history.pop(0)
-                self.memory_history.append(memory_info['percent'])
-                self.memory_history.pop(0)
-                self.disk_history.append(min(disk_rate, 100))  
-                self.disk_history.pop(0)
-                self.network_history.append(min(network_rate, 1000))  
-                self.network_history.pop(0)
-                
-                self.prev_time = current_time
-                
-                # Put data in queue
-                self.update_queue.put({
-                    'cpu': cpu_info,
-                    'memory': memory_info,
-                    'disk': disk_info,
-                    'network': network_info,
-                    'cpu_history': self.cpu_history.copy(),
-                    'memory_history': self.memory_history.copy(),
-                    'disk_history': self.disk_history.copy(),
-                    'network_history': self.network_history.copy(),
-                    'disk_rate': disk_rate,
-                    'network_rate': network_rate
-                })
+                self.receive_from_worker()
                 
                 # Process commands
-                if not self.command_queue.empty():
-                    try:
-                        command_type, data = self.command_queue.get_nowait()
-                        if command_type == 'execute':
-                            result = self.execute_command(data)
-                            self.command_result_queue.put(('command_result', result))
-                        elif command_type == 'kill_process':
-                            result = self.kill_process(data)
-                            self.command_result_queue.put(('kill_result', result))
-                    except queue.Empty:
-                        pass
-                
-                time.sleep(self.update_interval)
+                self.process_commands()
             except Exception as e:
                 print(f"Error in update: {e}")
                 time.sleep(1)
     
+    def get_collector_status(self):
+        """Get collector mode, data age in seconds, worker restart count and any fatal error"""
+        return {
+            'mode': 'process' if self.use_worker_process else 'thread',
+            'age': time.time() - self.last_sample_time if self.last_sample_time else None,
+            'restarts': self.worker_restarts,
+            'error': self.worker_error
+        }
+    
+    def request_process_refresh(self):
+        """Ask the collector to refresh the process table on its next sample"""
+        self.command_queue.put(('refresh_processes', None))
+    
+    def get_latest_processes(self):
+        """Get the most recently sent (filtered) process rows"""
+        return self.latest_processes
+    
+    def set_process_filter(self, spec):
+        """Filter the process list by a dict of name/regex/user/status/min_cpu/min_memory.
+        
+        Raises re.error or ValueError for an invalid filter, leaving the current one in place.
+        Query the registry for the new view; a rescan is only requested when the
+        name/user/status criteria widen to processes whose usage wasn't measured.
+        """
+        process_filter = ProcessFilter.from_dict(spec)
+        widened = not process_filter.narrows(self.process_filter)
+        self.process_filter = process_filter
+        self.process_filter_spec = dict(spec)
+        # Only a separate collector process needs to be told; a restarted one gets the spec at start
+        if self.worker is not None:
+            self.command_queue.put(('process_filter', spec))
+        if widened:
+            self.request_process_refresh()
+    
+    def query_processes(self):
+        """Get (rows, match_count, total) from the registry for the current filter without rescanning"""
+        count, rows = self.process_registry.query(self.process_filter, self.process_limit)
+        self.latest_processes = rows
+        return rows, count, len(self.process_registry)
+    
+    def get_process_choices(self):
+        """Get the distinct users and statuses in the process table"""
+        return self.process_registry.get_users(), self.process_registry.get_statuses()
+    
     def get_update(self):
         """Get latest data"""
         try:
@@ -294,6 +786,21 @@ class SystemMonitor:
         except queue.Empty:
             return None
     
+    def get_history(self, name, start, end=None, max_points=None):
+        """Get recorded history for a series from the tier matching the time range"""
+        return self.history.query(name, start, end if end is not None else time.time(), max_points)
+    
+    def get_anomaly_events(self, name, start, end=None):
+        """Get (timestamps, values) arrays of anomalies flagged on a series"""
+        end = end if end is not None else time.time()
+        events = [e for e in list(self.anomaly_events.get(name, ())) if start <= e[0] < end]
+        return np.array([e[0] for e in events]), np.array([e[1] for e in events])
+    
+    def request_process_action(self, action, selector, value=None, timeout=None):
+        """Queue a batch process action; its report arrives as a 'process_action_result'"""
+        self.command_queue.put(('process_action', {'action': action, 'selector': selector,
+                                                   'value': value, 'timeout': timeout}))
+    
     def get_command_result(self):
         """Get command result"""
         try:
@@ -303,7 +810,35 @@ class SystemMonitor:
     
     def get_commands(self):
         """Get available commands"""
-        return list(self.commands.keys())
+        return self.command_catalog.get_names()
+    
+    def get_bundles(self):
+        """Get available diagnostic bundles"""
+        return self.command_catalog.get_bundles()
+
+def run_collector_worker(conn, update_interval, process_interval, process_filter_spec=None):
+    """Collector process: send samples through the pipe until it is closed"""
+    monitor = SystemMonitor(update_interval)
+    monitor.process_interval = process_interval
+    # A restarted worker picks up the filter in effect, not just later changes
+    monitor.process_filter = ProcessFilter.from_dict(process_filter_spec)
+    engine = monitor.create_engine()
+    
+    def on_tick(tick_time, results):
+        try:
+            while conn.poll():
+                message = conn.recv()
+                if message == 'refresh_processes':
+                    engine.request('processes')
+                elif message[0] == 'process_filter':
+                    monitor.process_filter = ProcessFilter.from_dict(message[1])
+            sample = monitor.build_sample(tick_time, results)
+            if sample:
+                conn.send(sample)
+        except (EOFError, OSError):
+            engine.stop()
+    
+    asyncio.run(engine.run(on_tick))
 
 if __name__ == "__main__":
     print("System Monitor Backend - Testing...")
@@ -313,5 +848,6 @@ if __name__ == "__main__":
     print("CPU Info:", monitor.get_cpu_info())
     print("Memory Info:", monitor.get_memory_info())
     print("Commands:", monitor.get_commands())
+    print("Bundles:", monitor.get_bundles())
     
     print("Backend test completed!")
\ No newline at end of file
@@ -0,0 +1,312 @@
+import time
+import tkinter as tk
+import numpy as np
+import matplotlib.dates as mdates
+from datetime import datetime
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from history import decimate
+
+LOCAL_TZ = datetime.now().astimezone().tzinfo
+
+MIN_SPAN = 10
+MAX_SPAN = 30 * 24 * 3600
+
+
+def heat_color(percent):
+    """Map a 0-100% load to a color between the theme green and red in 10% steps"""
+    level = min(max(int(percent // 10), 0), 10) / 10
+    red = int(0x28 + level * (0xdc - 0x28))
+    green = int(0xa7 + level * (0x35 - 0xa7))
+    return f"#{red:02x}{green:02x}45"
+
+
+# Heat levels 0-10 plus a background entry for empty cells
+HEAT_PALETTE = np.array([heat_color(level * 10) for level in range(11)] + ['#ffffff'])
+
+
+def to_datenum(timestamps):
+    """Convert epoch seconds to matplotlib date numbers"""
+    return timestamps / 86400.0
+
+
+class TimeSeriesChart:
+    """History chart with a timestamp axis, wheel zoom and drag pan.
+
+    The chart follows live data until the user zooms or pans, then holds
+    the chosen window; double-click returns to live mode. Every redraw
+    queries the backend history for the visible range and decimates it to
+    the plot width, so long ranges never draw more points than pixels.
+
+    `series` and `color` may be lists to draw several series on one axis;
+    `labels` then names them in a legend. Anomalies are marked for the
+    first series.
+    """
+
+    def __init__(self, master, backend, series, title, ylabel, color, marker_color,
+                 ylim=None, figsize=(8, 3), span=60, labels=None):
+        self.backend = backend
+        self.series = [series] if isinstance(series, str) else list(series)
+        colors = [color] if isinstance(color, str) else list(color)
+        self.ylim = ylim
+        self.span = span
+        self.end = None  # None follows live data
+        self.drag = None
+
+        fig = Figure(figsize=figsize, dpi=80, facecolor='white')
+        self.ax = fig.add_subplot(111)
+        self.ax.set_title(title)
+        self.ax.set_ylabel(ylabel)
+        if ylim:
+            self.ax.set_ylim(*ylim)
+        self.ax.grid(True, alpha=0.3)
+
+        locator = mdates.AutoDateLocator(tz=LOCAL_TZ)
+        self.ax.xaxis.set_major_locator(locator)
+        self.ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator, tz=LOCAL_TZ))
+
+        self.lines = []
+        for i, name in enumerate(self.series):
+            label = labels[i] if labels else name
+            line, = self.ax.plot([], [], color=colors[i % len(colors)], linewidth=2, label=label)
+            self.lines.append(line)
+        if len(self.series) > 1:
+            self.ax.legend(loc='upper left', fontsize=8)
+        self.anomaly_line, = self.ax.plot([], [], linestyle='none', marker='o',
+                                          color=marker_color, markerfacecolor='none')
+
+        self.canvas = FigureCanvasTkAgg(fig, master=master)
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        self.canvas.mpl_connect('scroll_event', self.on_scroll)
+        self.canvas.mpl_connect('button_press_event', self.on_press)
+        self.canvas.mpl_connect('motion_notify_event', self.on_motion)
+        self.canvas.mpl_connect('button_release_event', self.on_release)
+
+    @property
+    def is_live(self):
+        return self.end is None
+
+    def visible_range(self):
+        """Get the (start, end) epoch range currently shown"""
+        end = self.end if self.end is not None else time.time()
+        return end - self.span, end
+
+    def set_span(self, seconds):
+        """Show the last `seconds` of data and follow live updates"""
+        self.span = seconds
+        self.end = None
+        self.refresh()
+
+    def go_live(self):
+        """Return to following live data"""
+        self.end = None
+        self.refresh()
+
+    def on_tick(self):
+        """Redraw for a new live sample; held windows and hidden charts stay put"""
+        if self.is_live and self.canvas.get_tk_widget().winfo_viewable():
+            self.refresh()
+
+    def refresh(self):
+        """Query the visible range and redraw"""
+        start, end = self.visible_range()
+        width = max(int(self.ax.bbox.width), 50)
+
+        for name, line in zip(self.series, self.lines):
+            data = self.backend.get_history(name, start, end)
+            if data is not None and len(data['timestamp']):
+                if data['tier'] == 'raw':
+                    x, y = decimate(data['timestamp'], data['avg'], width)
+                else:
+                    x, y = decimate(data['timestamp'], data['avg'], width, data['min'], data['max'])
+                line.set_data(to_datenum(x), y)
+            else:
+                line.set_data([], [])
+
+        events = self.backend.get_anomaly_events(self.series[0], start, end)
+        self.anomaly_line.set_data(to_datenum(events[0]), events[1])
+
+        self.ax.set_xlim(to_datenum(start), to_datenum(end))
+        if not self.ylim:
+            self.ax.relim()
+            self.ax.autoscale_view(scalex=False)
+        self.canvas.draw_idle()
+
+    def _hold(self, start, span):
+        """Hold a window, switching back to live when it reaches now"""
+        self.span = min(max(span, MIN_SPAN), MAX_SPAN)
+        end = start + self.span
+        self.end = None if end >= time.time() else end
+
+    def on_scroll(self, event):
+        """Zoom around the cursor"""
+        if event.xdata is None:
+            return
+        factor = 1 / 1.5 if event.button == 'up' else 1.5
+        cursor = event.xdata * 86400.0
+        start, end = self.visible_range()
+        self._hold(cursor - (cursor - start) * factor, (end - start) * factor)
+        self.refresh()
+
+    def on_press(self, event):
+        """Start a drag pan, or go live on double-click"""
+        if event.dblclick:
+            self.go_live()
+        elif event.button == 1 and event.x is not None:
+            self.drag = (event.x, self.visible_range()[0])
+
+    def on_motion(self, event):
+        """Pan while dragging"""
+        if self.drag is None or event.x is None:
+            return
+        press_x, press_start = self.drag
+        seconds_per_pixel = self.span / max(self.ax.bbox.width, 1)
+        self._hold(press_start - (event.x - press_x) * seconds_per_pixel, self.span)
+        self.refresh()
+
+    def on_release(self, event):
+        """Finish a drag pan"""
+        self.drag = None
+
+
+class CoreHeatmap:
+    """Per-core utilization heatmap drawn as two images.
+
+    The top grid shows one cell per logical CPU and the strip below shows
+    recent history, newest on the right, with cores grouped so the strip
+    stays a fixed height. Each tick redraws both images with a single
+    PhotoImage.put of one pixel per cell followed by a native zoom, so the
+    cost does not grow with widget count. Hovering shows per-core detail.
+    """
+
+    def __init__(self, master, topology, cell=12, columns=32, history=120, strip_height=64):
+        self.cell = cell
+        self.max_columns = columns
+        self.history_len = history
+        self.strip_height = strip_height
+        self.strip_px = 2
+        self.count = 0
+        self.values = np.zeros(0)
+        self.freqs = []
+        self.tooltip = None
+
+        self.cpu_nodes = {cpu: node for node, cpus in topology['numa'].items() for cpu in cpus}
+        self.cpu_siblings = {cpu: group for group in topology['smt_siblings'] for cpu in group}
+
+        self.canvas = tk.Canvas(master, height=20, bg='#ffffff', highlightthickness=0)
+        self.canvas.pack(fill=tk.X, pady=5)
+        self.canvas.bind('<Motion>', self.on_motion)
+        self.canvas.bind('<Leave>', self.hide_tooltip)
+
+    def _layout(self, count):
+        """Size the images for a new core count"""
+        self.count = count
+        self.columns = min(count, self.max_columns)
+        self.grid_rows = (count + self.columns - 1) // self.columns
+
+        # Group cores so the strip has at most strip_height / 2 rows
+        max_rows = max(self.strip_height // 2, 1)
+        self.group = (count + max_rows - 1) // max_rows
+        self.strip_rows = (count + self.group - 1) // self.group
+        self.row_px = min(max(self.strip_height // self.strip_rows, 1), 8)
+        self.strip = np.full((self.strip_rows, self.history_len), np.nan)
+
+        self.grid_image = tk.PhotoImage(width=self.columns, height=self.grid_rows)
+        self.strip_image = tk.PhotoImage(width=self.history_len, height=self.strip_rows)
+        self.grid_zoom = self.strip_zoom = None
+
+        self.canvas.delete('all')
+        self.grid_y = 0
+        self.label_y = self.grid_rows * self.cell + 4
+        self.strip_y = self.label_y + 16
+        self.grid_item = self.canvas.create_image(0, self.grid_y, anchor='nw')
+        group_text = f", {self.group} cores per row" if self.group > 1 else ""
+        self.canvas.create_text(0, self.label_y, anchor='nw', font=('Arial', 8),
+                                text=f"History (last {self.history_len} samples{group_text})")
+        self.strip_item = self.canvas.create_image(0, self.strip_y, anchor='nw')
+        self.canvas.configure(height=self.strip_y + self.strip_rows * self.row_px + 2)
+
+    @staticmethod
+    def image_data(values):
+        """Build PhotoImage.put data for a 2D array of percentages (NaN = empty)"""
+        levels = np.where(np.isnan(values), 11, np.clip(np.nan_to_num(values) // 10, 0, 10)).astype(int)
+        colors = HEAT_PALETTE[levels]
+        return ' '.join('{' + ' '.join(row) + '}' for row in colors)
+
+    def update(self, per_cpu, per_cpu_freq=None):
+        """Draw a new sample for all cores"""
+        values = np.asarray(per_cpu, dtype=float)
+        if len(values) == 0:
+            return
+        if len(values) != self.count:
+            self._layout(len(values))
+        self.values = values
+        self.freqs = per_cpu_freq or []
+
+        grid = np.full(self.grid_rows * self.columns, np.nan)
+        grid[:self.count] = values
+        self.grid_image.put(self.image_data(grid.reshape(self.grid_rows, self.columns)))
+        self.grid_zoom = self.grid_image.zoom(self.cell)
+        self.canvas.itemconfig(self.grid_item, image=self.grid_zoom)
+
+        # Busiest core of each group, shifted into the strip
+        grouped = np.zeros(self.strip_rows * self.group)
+        grouped[:self.count] = values
+        self.strip[:, :-1] = self.strip[:, 1:]
+        self.strip[:, -1] = grouped.reshape(self.strip_rows, self.group).max(axis=1)
+        self.strip_image.put(self.image_data(self.strip))
+        self.strip_zoom = self.strip_image.zoom(self.strip_px, self.row_px)
+        self.canvas.itemconfig(self.strip_item, image=self.strip_zoom)
+
+    def describe(self, x, y):
+        """Get tooltip text for a canvas position, or None"""
+        if self.count == 0 or x < 0:
+            return None
+
+        if y < self.grid_rows * self.cell:
+            column, row = x // self.cell, y // self.cell
+            cpu = row * self.columns + column
+            if column >= self.columns or cpu >= self.count:
+                return None
+            lines = [f"CPU {cpu}: {self.values[cpu]:.1f}%"]
+            if cpu < len(self.freqs):
+                lines.append(f"Frequency: {self.freqs[cpu]:.0f} MHz")
+            if cpu in self.cpu_siblings and len(self.cpu_siblings[cpu]) > 1:
+                lines.append(f"SMT siblings: {', '.join(map(str, self.cpu_siblings[cpu]))}")
+            if cpu in self.cpu_nodes:
+                lines.append(f"NUMA node: {self.cpu_nodes[cpu]}")
+            return '\n'.join(lines)
+
+        if y >= self.strip_y:
+            row, sample = (y - self.strip_y) // self.row_px, x // self.strip_px
+            if row >= self.strip_rows or sample >= self.history_len or np.isnan(self.strip[row, sample]):
+                return None
+            first = row * self.group
+            last = min(first + self.group, self.count) - 1
+            cpus = f"CPU {first}" if first == last else f"CPUs {first}-{last} (busiest)"
+            return f"{cpus}: {self.strip[row, sample]:.1f}%\n{self.history_len - 1 - sample} samples ago"
+        return None
+
+    def on_motion(self, event):
+        """Show or move the tooltip"""
+        text = self.describe(event.x, event.y)
+        if text is None:
+            self.hide_tooltip()
+            return
+
+        if self.tooltip is None:
+            self.tooltip = tk.Toplevel(self.canvas)
+            self.tooltip.wm_overrideredirect(True)
+            self.tooltip_label = tk.Label(self.tooltip, justify=tk.LEFT, background='#f8f9fa',
+                                          relief=tk.SOLID, borderwidth=1, font=('Arial', 9))
+            self.tooltip_label.pack()
+        self.tooltip_label.config(text=text)
+        self.tooltip.wm_geometry(f"+{event.x_root + 12}+{event.y_root + 12}")
+
+    def hide_tooltip(self, event=None):
+        """Remove the tooltip"""
+        if self.tooltip is not None:
+            self.tooltip.destroy()
+            self.tooltip = None
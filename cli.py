@@ -0,0 +1,168 @@
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from recording import Recording, detect_format
+
+STREAM_FORMATS = ('csv', 'jsonl')
+
+
+def parse_time(text):
+    """Parse epoch seconds or an ISO 8601 local time"""
+    if text is None:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.fromisoformat(text).timestamp()
+
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def capture_live(duration, interval, stream=None):
+    """Collect live samples as recording rows until `duration` elapses or Ctrl+C.
+
+    When `stream` is a file, each row is also written to it as JSON Lines
+    as soon as it arrives.
+    """
+    from backend import SystemMonitor
+
+    monitor = SystemMonitor(update_interval=interval)
+    monitor.start()
+    rows = []
+    deadline = time.time() + duration if duration else None
+    try:
+        while deadline is None or time.time() < deadline:
+            try:
+                sample = monitor.update_queue.get(timeout=interval)
+            except Exception:
+                continue
+            row = {'timestamp': sample['timestamp'], 'metrics': monitor.sample_series(sample)}
+            if 'processes' in sample:
+                # The sample only carries the GUI's top rows; record the whole table
+                row['processes'] = monitor.process_registry.query(limit=None)[1]
+            rows.append(row)
+            if stream:
+                stream.write(json.dumps(row) + '\n')
+                stream.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        monitor.stop()
+    return rows
+
+
+def cmd_dump(args):
+    """Export live or recorded samples"""
+    fmt = args.format or (detect_format(args.output) if args.output else 'jsonl')
+    if args.output is None and fmt not in STREAM_FORMATS:
+        sys.exit(f"--output is required for {fmt} files")
+
+    if args.input:
+        recording = Recording.load(args.input)
+    else:
+        # Live JSON Lines to stdout are streamed as samples arrive
+        stream = sys.stdout if fmt == 'jsonl' and args.output is None else None
+        rows = capture_live(args.duration, args.interval, stream)
+        if stream:
+            return
+        recording = Recording.from_rows(rows)
+
+    recording = recording.between(parse_time(args.start), parse_time(args.end))
+
+    if args.output:
+        recording.save(args.output, fmt)
+        print(f"Wrote {len(recording.timestamps)} samples to {args.output}", file=sys.stderr)
+    elif fmt == 'jsonl':
+        for row in recording.rows():
+            print(json.dumps(row))
+    else:
+        recording.write_csv(sys.stdout)
+
+
+def cmd_query(args):
+    """Aggregate a metric per time window"""
+    if args.window <= 0:
+        sys.exit("--window must be greater than 0")
+    recording = Recording.load(args.input)
+    if args.metric not in recording.metrics:
+        sys.exit(f"Unknown metric {args.metric}; available: {', '.join(recording.metrics)}")
+
+    windows, values = recording.window_aggregate(args.metric, args.agg, args.window,
+                                                 parse_time(args.start), parse_time(args.end))
+    print(f"{'window start':<20} {args.agg}({args.metric})")
+    for window, value in zip(windows, values):
+        print(f"{format_time(window):<20} {value:.2f}")
+
+
+def cmd_top(args):
+    """Show the top processes at a point in time"""
+    recording = Recording.load(args.input)
+    snapshot, rows = recording.top_processes(parse_time(args.at), args.by, args.limit)
+    if snapshot is None:
+        sys.exit("No process snapshot at or before that time")
+
+    print(f"Process snapshot at {format_time(snapshot)}")
+    print(f"{'PID':>8} {'Name':<40} {'CPU %':>7} {'Mem %':>7} {'RSS MB':>10}")
+    for row in rows:
+        print(f"{row['pid']:>8} {row['name']:<40} {row['cpu_percent']:>7.1f} "
+              f"{row['memory_percent']:>7.1f} {row['rss'] / (1024**2):>10.1f}")
+
+
+def cmd_metrics(args):
+    """List the metrics in a recording"""
+    recording = Recording.load(args.input)
+    if len(recording.timestamps):
+        print(f"{len(recording.timestamps)} samples from {format_time(recording.timestamps[0])} "
+              f"to {format_time(recording.timestamps[-1])}")
+    for name in recording.metrics:
+        print(name)
+
+
+def main(argv=None):
+    """System Monitor command line: export and query metrics without the GUI"""
+    parser = argparse.ArgumentParser(description="Export and query System Resource Monitor metrics")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    dump = subparsers.add_parser('dump', help="export live or recorded samples")
+    dump.add_argument('--input', help="recording to read instead of capturing live data")
+    dump.add_argument('--output', help="file to write; format follows the extension")
+    dump.add_argument('--format', choices=['csv', 'jsonl', 'npz', 'parquet', 'arrow'])
+    dump.add_argument('--duration', type=float, help="seconds of live data to capture (default: until Ctrl+C)")
+    dump.add_argument('--interval', type=float, default=1.0, help="live sampling interval in seconds")
+    dump.add_argument('--start', help="only samples at or after this time (epoch or ISO 8601)")
+    dump.add_argument('--end', help="only samples before this time (epoch or ISO 8601)")
+    dump.set_defaults(func=cmd_dump)
+
+    query = subparsers.add_parser('query', help="aggregate a metric per time window")
+    query.add_argument('metric', help="metric name, e.g. cpu, memory, load1")
+    query.add_argument('--input', required=True)
+    query.add_argument('--agg', choices=['max', 'min', 'avg', 'p95', 'count'], default='max')
+    query.add_argument('--window', type=float, default=300, help="window length in seconds")
+    query.add_argument('--start')
+    query.add_argument('--end')
+    query.set_defaults(func=cmd_query)
+
+    top = subparsers.add_parser('top', help="top processes at a point in time")
+    top.add_argument('--input', required=True)
+    top.add_argument('--at', help="time of interest (default: end of recording)")
+    top.add_argument('--by', choices=['rss', 'cpu_percent', 'memory_percent'], default='rss')
+    top.add_argument('--limit', type=int, default=10)
+    top.set_defaults(func=cmd_top)
+
+    metrics = subparsers.add_parser('metrics', help="list the metrics in a recording")
+    metrics.add_argument('--input', required=True)
+    metrics.set_defaults(func=cmd_metrics)
+
+    args = parser.parse_args(argv)
+    try:
+        args.func(args)
+    except (ImportError, ValueError, KeyError, OSError) as e:
+        sys.exit(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
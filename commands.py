@@ -0,0 +1,122 @@
+import json
+import os
+import platform
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'commands.json')
+
+
+class CommandCatalog:
+    """Cross-platform command catalog loaded from a JSON config file.
+
+    Each command entry maps OS names ('windows', 'linux', 'darwin') to an
+    argument list, with 'default' used when the current OS has no variant.
+    Arguments may contain '{name}' placeholders filled from the entry's
+    'args' defaults or from parameters passed at run time.
+    """
+
+    def __init__(self, path=None, os_name=None):
+        self.path = path or os.environ.get('SYSMON_COMMANDS', DEFAULT_CATALOG_PATH)
+        self.os_name = (os_name or platform.system()).lower()
+        self.default_timeout = 15
+        self.commands = {}
+        self.bundles = {}
+        self.load()
+
+    def load(self):
+        """Load (or reload) the catalog from disk"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+        self.default_timeout = config.get('defaults', {}).get('timeout', 15)
+        self.commands = {}
+        for name, entry in config.get('commands', {}).items():
+            # Skip commands that have no variant for this OS
+            if self.os_name in entry or 'default' in entry:
+                self.commands[name] = entry
+
+        self.bundles = {}
+        for name, members in config.get('bundles', {}).items():
+            self.bundles[name] = [m for m in members if m in self.commands]
+
+    def get_names(self):
+        """Get command names available on this OS"""
+        return list(self.commands.keys())
+
+    def get_bundles(self):
+        """Get diagnostic bundle names"""
+        return list(self.bundles.keys())
+
+    def resolve(self, name, params=None):
+        """Build the argument list and timeout for a command"""
+        entry = self.commands[name]
+        template = entry.get(self.os_name, entry.get('default'))
+        values = dict(entry.get('args', {}))
+        values.update(params or {})
+        args = [str(part).format(**values) for part in template]
+        return args, entry.get('timeout', self.default_timeout)
+
+    def run(self, name, params=None):
+        """Run a single command without a shell"""
+        if name not in self.commands:
+            return {'success': False, 'output': 'Command not found'}
+
+        timeout = self.default_timeout
+        start = time.time()
+        try:
+            args, timeout = self.resolve(name, params)
+            result = subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+
+            if result.returncode == 0:
+                output = {'success': True, 'output': result.stdout}
+            else:
+                output = {'success': False, 'output': result.stderr or result.stdout or 'Command failed'}
+            output['returncode'] = result.returncode
+        except KeyError as e:
+            output = {'success': False, 'output': f'Missing argument: {e}'}
+        except FileNotFoundError:
+            output = {'success': False, 'output': f'Command not available on {self.os_name}'}
+        except subprocess.TimeoutExpired:
+            output = {'success': False, 'output': f'Command timeout ({timeout} seconds)'}
+        except Exception as e:
+            output = {'success': False, 'output': f'Error: {str(e)}'}
+
+        output['started'] = start
+        output['duration'] = time.time() - start
+        return output
+
+    def run_bundle(self, bundle, params=None):
+        """Run a bundle of commands concurrently and combine their output.
+
+        `bundle` is a bundle name or a list of command names. Total time is
+        bounded by the slowest command rather than the sum of all of them.
+        """
+        names = self.bundles.get(bundle, []) if isinstance(bundle, str) else list(bundle)
+        if not names:
+            return {'success': False, 'output': 'Bundle not found or empty'}
+
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            futures = [executor.submit(self.run, name, params) for name in names]
+            results = [future.result() for future in futures]
+        duration = time.time() - start
+
+        title = bundle if isinstance(bundle, str) else 'Diagnostics'
+        lines = [f"=== {title} started {datetime.fromtimestamp(start).strftime('%Y-%m-%d %H:%M:%S')} "
+                 f"({len(names)} commands) ==="]
+        for name, result in zip(names, results):
+            stamp = datetime.fromtimestamp(result['started']).strftime('%H:%M:%S.%f')[:-3]
+            status = 'ok' if result['success'] else 'failed'
+            lines.append(f"\n[{stamp}] {name} - {status} in {result['duration']:.2f}s")
+            lines.append(result['output'].rstrip())
+        lines.append(f"\n=== {title} completed in {duration:.2f}s ===")
+
+        return {
+            'success': all(r['success'] for r in results),
+            'output': '\n'.join(lines),
+            'duration': duration,
+            'results': dict(zip(names, results))
+        }
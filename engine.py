@@ -0,0 +1,132 @@
+import asyncio
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Collector:
+    """A collection function with its own deadline and period"""
+
+    def __init__(self, name, func, deadline, period):
+        self.name = name
+        self.func = func
+        self.deadline = deadline
+        self.period = period
+        self.executor = None
+        self.task = None
+        self.started = None
+        self.last_start = float('-inf')
+        self.forced = False
+        self.value = None
+        self.timestamp = None
+        self.error = None
+
+
+class CollectionEngine:
+    """asyncio engine that runs collectors concurrently on wall-clock ticks.
+
+    Ticks fall on multiples of `interval` seconds of wall-clock time and
+    the next tick is always computed from the clock, so cadence never
+    drifts; ticks missed while a tick overran are skipped. Each collector
+    runs on its own worker thread, always the same one, because psutil
+    keeps "since last call" baselines such as cpu_percent(interval=None)
+    per thread. Each collector has its own deadline. A collector that
+    misses it keeps running in the background without holding up the
+    tick, and its previous result is reused until the new one lands.
+    Every result carries the time it was measured.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.collectors = {}
+        self.running = False
+        self.skipped_ticks = 0
+
+    def add(self, name, func, deadline=None, period=None):
+        """Register a collector; `period` defaults to every tick"""
+        self.collectors[name] = Collector(name, func,
+                                          deadline if deadline is not None else 0.8 * self.interval,
+                                          period if period is not None else self.interval)
+
+    def request(self, name):
+        """Run a collector on the next tick regardless of its period"""
+        self.collectors[name].forced = True
+
+    @staticmethod
+    def _measure(func):
+        """Run a collector and return its value with the measurement midpoint"""
+        start = time.time()
+        value = func()
+        return value, (start + time.time()) / 2
+
+    def _finish(self, collector):
+        """Store the result of a completed collector task"""
+        try:
+            collector.value, collector.timestamp = collector.task.result()
+            collector.error = None
+        except Exception as e:
+            collector.error = str(e)
+        collector.task = None
+
+    async def tick(self, tick_time):
+        """Start due collectors and wait for them until their deadlines.
+
+        Returns {name: {'value', 'timestamp', 'fresh'}} for every collector
+        that has produced a value; 'fresh' is False for reused results.
+        """
+        loop = asyncio.get_running_loop()
+        for collector in self.collectors.values():
+            due = tick_time - collector.last_start >= collector.period - 1e-3
+            if collector.task is None and (due or collector.forced):
+                collector.task = loop.run_in_executor(collector.executor, self._measure, collector.func)
+                collector.started = time.time()
+                collector.last_start = tick_time
+                collector.forced = False
+
+        # Wait for each running collector until its own deadline
+        fresh = set()
+        for collector in self.collectors.values():
+            if collector.task is None:
+                continue
+            remaining = collector.started + collector.deadline - time.time()
+            if not collector.task.done() and remaining > 0:
+                await asyncio.wait([collector.task], timeout=remaining)
+            if collector.task.done():
+                self._finish(collector)
+                fresh.add(collector.name)
+
+        results = {}
+        for collector in self.collectors.values():
+            if collector.timestamp is not None:
+                results[collector.name] = {
+                    'value': collector.value,
+                    'timestamp': collector.timestamp,
+                    'fresh': collector.name in fresh
+                }
+        return results
+
+    async def run(self, on_tick):
+        """Run ticks until stop(), calling on_tick(tick_time, results) after each"""
+        self.running = True
+        # A collector never overlaps itself, so one thread each is enough
+        for collector in self.collectors.values():
+            collector.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'collector-{collector.name}')
+        try:
+            next_tick = math.floor(time.time() / self.interval) * self.interval
+            while self.running:
+                next_tick += self.interval
+                now = time.time()
+                if now > next_tick:
+                    # Overran: skip to the next boundary instead of bursting
+                    missed = math.ceil((now - next_tick) / self.interval)
+                    self.skipped_ticks += missed
+                    next_tick += missed * self.interval
+                await asyncio.sleep(next_tick - time.time())
+                on_tick(next_tick, await self.tick(next_tick))
+        finally:
+            for collector in self.collectors.values():
+                collector.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stop(self):
+        """Stop after the current tick"""
+        self.running = False
@@ -1,8 +1,8 @@
+import re
 import tkinter as tk
 from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
+from charts import CoreHeatmap, TimeSeriesChart
+from process_actions import ACTIONS
 
 class SystemMonitorUI:
     def __init__(self, root, backend):
@@ -19,6 +19,17 @@ class SystemMonitorUI:
             'dark_gray': '#6c757d'
         }
         
+        # Chart time ranges in seconds
+        self.chart_ranges = {
+            '1 min': 60,
+            '5 min': 300,
+            '15 min': 900,
+            '1 hour': 3600,
+            '6 hours': 6 * 3600,
+            '1 day': 24 * 3600,
+            '7 days': 7 * 24 * 3600
+        }
+        
         # Configure window
         self.root.title("System Resource Monitor")
         self.root.geometry("1000x700")
@@ -36,6 +47,21 @@ class SystemMonitorUI:
         # Handle window close
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
     
+    @property
+    def charts(self):
+        return tuple(self.cpu_charts) + tuple(self.memory_charts) + (self.network_chart,)
+    
+    def on_range_change(self, event=None):
+        """Apply the selected history range to all charts"""
+        span = self.chart_ranges[self.range_var.get()]
+        for chart in self.charts:
+            chart.set_span(span)
+    
+    def charts_live(self):
+        """Return all charts to live mode"""
+        for chart in self.charts:
+            chart.go_live()
+    
     def setup_theme(self):
         """Setup theme"""
         style = ttk.Style()
@@ -76,6 +102,15 @@ class SystemMonitorUI:
                                     values=["1", "2", "5"], width=5, state="readonly")
         refresh_combo.pack(side=tk.RIGHT)
         
+        # Chart time range; wheel zooms, drag pans, double-click returns to live
+        ttk.Button(header, text="Live", command=self.charts_live).pack(side=tk.RIGHT, padx=(0, 15))
+        self.range_var = tk.StringVar(value="1 min")
+        range_combo = ttk.Combobox(header, textvariable=self.range_var, values=list(self.chart_ranges),
+                                  width=8, state="readonly")
+        range_combo.pack(side=tk.RIGHT, padx=(0, 5))
+        range_combo.bind("<<ComboboxSelected>>", self.on_range_change)
+        ttk.Label(header, text="History:").pack(side=tk.RIGHT, padx=(0, 5))
+        
         # Notebook with 6 tabs
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -104,10 +139,23 @@ class SystemMonitorUI:
         self.setup_commands_tab()
         
         # Status bar
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=5)
+        
         self.status_var = tk.StringVar(value="Ready")
-        status_bar = ttk.Label(self.root, textvariable=self.status_var, 
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, 
                               relief=tk.SUNKEN, anchor=tk.W)
-        status_bar.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=5)
+        status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.anomaly_var = tk.StringVar(value="No anomalies")
+        self.anomaly_label = ttk.Label(status_frame, textvariable=self.anomaly_var,
+                                      relief=tk.SUNKEN, anchor=tk.E)
+        self.anomaly_label.pack(side=tk.RIGHT)
+        
+        self.collector_var = tk.StringVar(value="")
+        self.collector_label = ttk.Label(status_frame, textvariable=self.collector_var,
+                                        relief=tk.SUNKEN, anchor=tk.E)
+        self.collector_label.pack(side=tk.RIGHT, padx=(0, 5))
     
     def setup_cpu_tab(self):
         """Setup CPU tab"""
@@ -133,28 +181,35 @@ class SystemMonitorUI:
         self.cpu_label = ttk.Label(overall_frame, text="0%", font=('Arial', 12, 'bold'))
         self.cpu_label.pack(side=tk.LEFT)
         
-        # Per-core usage
-        self.cores_frame = ttk.Frame(usage_frame)
-        self.cores_frame.pack(fill=tk.X, pady=5)
-        self.cpu_core_bars = []
-        self.cpu_core_labels = []
-        
-        # CPU Chart
-        chart_frame = ttk.LabelFrame(self.cpu_tab, text="CPU Usage History", padding=10)
-        chart_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        fig = Figure(figsize=(8, 3), dpi=80, facecolor='white')
-        self.cpu_ax = fig.add_subplot(111)
-        self.cpu_ax.set_title("CPU Usage Over Time")
-        self.cpu_ax.set_ylabel("Usage (%)")
-        self.cpu_ax.set_ylim(0, 100)
-        self.cpu_ax.grid(True, alpha=0.3)
-        
-        self.cpu_line, = self.cpu_ax.plot([], [], color=self.colors['red'], linewidth=2)
-        
-        self.cpu_canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        self.cpu_canvas.draw()
-        self.cpu_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # Per-core usage as a compact heatmap, one cell per logical CPU
+        ttk.Label(usage_frame, text="Per-core usage (green = idle, red = busy, hover for detail):").pack(anchor=tk.W)
+        self.core_heatmap = CoreHeatmap(usage_frame, self.backend.cpu_topology)
+        
+        # CPU Charts, one sub-tab per signal
+        chart_notebook = ttk.Notebook(self.cpu_tab)
+        chart_notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        chart_specs = [
+            ("Usage", 'cpu', "CPU Usage Over Time", "Usage (%)", self.colors['red'], (0, 100), None),
+            ("Load", ['load1', 'load5', 'load15'], "Load Average", "Load",
+             [self.colors['red'], self.colors['blue'], self.colors['green']], None, ["1 min", "5 min", "15 min"]),
+            ("Pressure", ['cpu_pressure_some', 'cpu_pressure_full'], "CPU Pressure (PSI avg10)", "Stalled (%)",
+             [self.colors['red'], self.colors['blue']], None, ["Some", "Full"]),
+            ("Steal / IOwait", ['steal', 'iowait'], "Steal and IOwait", "Time (%)",
+             [self.colors['red'], self.colors['blue']], None, ["Steal", "IOwait"]),
+            ("Switches / IRQs", ['ctx_switches', 'interrupts'], "Context Switches and Interrupts", "Per second",
+             [self.colors['red'], self.colors['blue']], None, ["Context switches", "Interrupts"]),
+            ("Frequency", 'cpu_freq', "Average Core Frequency", "MHz", self.colors['green'], None, None)
+        ]
+        
+        self.cpu_charts = []
+        for tab_name, series, title, ylabel, color, ylim, labels in chart_specs:
+            chart_frame = ttk.Frame(chart_notebook, padding=5)
+            chart_notebook.add(chart_frame, text=tab_name)
+            self.cpu_charts.append(TimeSeriesChart(chart_frame, self.backend, series, title, ylabel, color,
+                                                   self.colors['blue'], ylim=ylim, figsize=(8, 2.5),
+                                                   labels=labels))
+        self.cpu_chart = self.cpu_charts[0]
     
     def setup_memory_tab(self):
         """Setup Memory tab"""
@@ -179,22 +234,43 @@ class SystemMonitorUI:
         self.memory_label = ttk.Label(usage_bar_frame, text="0%", font=('Arial', 12, 'bold'))
         self.memory_label.pack(side=tk.LEFT)
         
-        # Memory Chart
-        chart_frame = ttk.LabelFrame(self.memory_tab, text="Memory Usage History", padding=10)
-        chart_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        
-        fig = Figure(figsize=(8, 3), dpi=80, facecolor='white')
-        self.memory_ax = fig.add_subplot(111)
-        self.memory_ax.set_title("Memory Usage Over Time")
-        self.memory_ax.set_ylabel("Usage (%)")
-        self.memory_ax.set_ylim(0, 100)
-        self.memory_ax.grid(True, alpha=0.3)
-        
-        self.memory_line, = self.memory_ax.plot([], [], color=self.colors['blue'], linewidth=2)
-        
-        self.memory_canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        self.memory_canvas.draw()
-        self.memory_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # Swap, page cache, pressure and NUMA breakdown
+        detail_frame = ttk.LabelFrame(self.memory_tab, text="Memory Breakdown", padding=10)
+        detail_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.memory_detail_label = ttk.Label(detail_frame, text="Loading memory breakdown...", justify=tk.LEFT)
+        self.memory_detail_label.pack(anchor=tk.W)
+        
+        # Memory Charts, one sub-tab per signal
+        chart_notebook = ttk.Notebook(self.memory_tab)
+        chart_notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        numa_nodes = self.backend.get_numa_nodes()
+        chart_specs = [
+            ("Usage", 'memory', "Memory Usage Over Time", "Usage (%)", self.colors['blue'], (0, 100), None),
+            ("Swap", ['swap_in', 'swap_out'], "Swap Activity", "MB/s",
+             [self.colors['blue'], self.colors['red']], None, ["Swap in", "Swap out"]),
+            ("Page Cache", ['cached', 'buffers', 'dirty', 'writeback'], "Page Cache", "MB",
+             [self.colors['blue'], self.colors['green'], self.colors['red'], self.colors['dark_gray']], None,
+             ["Cached", "Buffers", "Dirty", "Writeback"]),
+            ("Pressure", ['memory_pressure_some', 'memory_pressure_full'], "Memory Pressure (PSI avg10)",
+             "Stalled (%)", [self.colors['blue'], self.colors['red']], None, ["Some", "Full"]),
+            ("Major Faults", 'major_faults', "Major Page Faults", "Faults/s", self.colors['red'], None, None)
+        ]
+        if numa_nodes:
+            chart_specs.append(("NUMA", [f'numa:{node}' for node in numa_nodes], "Per-Node Memory Usage",
+                                "Usage (%)", [self.colors['blue'], self.colors['green'], self.colors['red'],
+                                              self.colors['dark_gray']], (0, 100),
+                                [f"Node {node}" for node in numa_nodes]))
+        
+        self.memory_charts = []
+        for tab_name, series, title, ylabel, color, ylim, labels in chart_specs:
+            chart_frame = ttk.Frame(chart_notebook, padding=5)
+            chart_notebook.add(chart_frame, text=tab_name)
+            self.memory_charts.append(TimeSeriesChart(chart_frame, self.backend, series, title, ylabel, color,
+                                                      self.colors['red'], ylim=ylim, figsize=(8, 2.5),
+                                                      labels=labels))
+        self.memory_chart = self.memory_charts[0]
     
     def setup_disk_tab(self):
         """Setup Disk tab"""
@@ -261,17 +337,8 @@ class SystemMonitorUI:
         chart_frame = ttk.LabelFrame(self.network_tab, text="Network Activity History", padding=10)
         chart_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        fig = Figure(figsize=(8, 2), dpi=80, facecolor='white')
-        self.network_ax = fig.add_subplot(111)
-        self.network_ax.set_title("Network Activity Over Time")
-        self.network_ax.set_ylabel("KB/s")
-        self.network_ax.grid(True, alpha=0.3)
-        
-        self.network_line, = self.network_ax.plot([], [], color=self.colors['green'], linewidth=2)
-        
-        self.network_canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        self.network_canvas.draw()
-        self.network_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.network_chart = TimeSeriesChart(chart_frame, self.backend, 'network', "Network Activity Over Time",
+                                             "KB/s", self.colors['green'], self.colors['red'], figsize=(8, 2))
     
     def setup_processes_tab(self):
         """Setup Processes tab"""
@@ -282,21 +349,87 @@ class SystemMonitorUI:
         ttk.Button(controls, text="Refresh", command=self.refresh_processes).pack(side=tk.LEFT)
         ttk.Button(controls, text="Kill Process", command=self.kill_process).pack(side=tk.LEFT, padx=(10, 0))
         
+        # Batch actions on the selected rows or on every process matching name/user/cgroup
+        batch = ttk.LabelFrame(self.processes_tab, text="Batch Action", padding=5)
+        batch.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.action_var = tk.StringVar(value='terminate')
+        self.action_value_var = tk.StringVar()
+        self.match_name_var = tk.StringVar()
+        self.match_regex_var = tk.BooleanVar(value=False)
+        self.match_user_var = tk.StringVar()
+        self.match_cgroup_var = tk.StringVar()
+        
+        ttk.Combobox(batch, textvariable=self.action_var, values=ACTIONS, state='readonly',
+                     width=10).pack(side=tk.LEFT)
+        ttk.Label(batch, text="Value:").pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Entry(batch, textvariable=self.action_value_var, width=8).pack(side=tk.LEFT)
+        ttk.Label(batch, text="Name:").pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Entry(batch, textvariable=self.match_name_var, width=15).pack(side=tk.LEFT)
+        ttk.Checkbutton(batch, text="Regex", variable=self.match_regex_var).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Label(batch, text="User:").pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Entry(batch, textvariable=self.match_user_var, width=10).pack(side=tk.LEFT)
+        ttk.Label(batch, text="Cgroup:").pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Entry(batch, textvariable=self.match_cgroup_var, width=15).pack(side=tk.LEFT)
+        ttk.Button(batch, text="Apply to Matching",
+                   command=self.apply_to_matching).pack(side=tk.RIGHT)
+        ttk.Button(batch, text="Apply to Selected",
+                   command=self.apply_to_selected).pack(side=tk.RIGHT, padx=(0, 5))
+        
+        # Filter bar, applied by the backend registry as you type
+        filter_bar = ttk.Frame(self.processes_tab)
+        filter_bar.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.filter_name_var = tk.StringVar()
+        self.filter_regex_var = tk.BooleanVar(value=False)
+        self.filter_user_var = tk.StringVar()
+        self.filter_status_var = tk.StringVar()
+        self.filter_cpu_var = tk.StringVar()
+        self.filter_memory_var = tk.StringVar()
+        self.filter_job = None
+        
+        ttk.Label(filter_bar, text="Search:").pack(side=tk.LEFT)
+        ttk.Entry(filter_bar, textvariable=self.filter_name_var, width=20).pack(side=tk.LEFT, padx=(2, 0))
+        ttk.Checkbutton(filter_bar, text="Regex", variable=self.filter_regex_var).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Label(filter_bar, text="User:").pack(side=tk.LEFT, padx=(10, 2))
+        self.filter_user_box = ttk.Combobox(filter_bar, textvariable=self.filter_user_var, width=12,
+                                            postcommand=self.update_filter_choices)
+        self.filter_user_box.pack(side=tk.LEFT)
+        ttk.Label(filter_bar, text="Status:").pack(side=tk.LEFT, padx=(10, 2))
+        self.filter_status_box = ttk.Combobox(filter_bar, textvariable=self.filter_status_var, width=10,
+                                              postcommand=self.update_filter_choices)
+        self.filter_status_box.pack(side=tk.LEFT)
+        ttk.Label(filter_bar, text="CPU % \u2265").pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Entry(filter_bar, textvariable=self.filter_cpu_var, width=5).pack(side=tk.LEFT)
+        ttk.Label(filter_bar, text="Mem % \u2265").pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Entry(filter_bar, textvariable=self.filter_memory_var, width=5).pack(side=tk.LEFT)
+        ttk.Button(filter_bar, text="Clear", command=self.clear_process_filter).pack(side=tk.RIGHT)
+        
+        self.filter_error_var = tk.StringVar()
+        ttk.Label(filter_bar, textvariable=self.filter_error_var,
+                  foreground=self.colors['red']).pack(side=tk.RIGHT, padx=5)
+        
+        for var in (self.filter_name_var, self.filter_regex_var, self.filter_user_var,
+                    self.filter_status_var, self.filter_cpu_var, self.filter_memory_var):
+            var.trace_add('write', self.schedule_process_filter)
+        
         # Process list
         list_frame = ttk.Frame(self.processes_tab)
         list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        columns = ("pid", "name", "cpu", "memory", "status")
+        columns = ("pid", "name", "user", "cpu", "memory", "status")
         self.process_tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=20)
         
         self.process_tree.heading("pid", text="PID")
         self.process_tree.heading("name", text="Process Name")
+        self.process_tree.heading("user", text="User")
         self.process_tree.heading("cpu", text="CPU %")
         self.process_tree.heading("memory", text="Memory %")
         self.process_tree.heading("status", text="Status")
         
         self.process_tree.column("pid", width=80)
         self.process_tree.column("name", width=250)
+        self.process_tree.column("user", width=100)
         self.process_tree.column("cpu", width=80)
         self.process_tree.column("memory", width=80)
         self.process_tree.column("status", width=100)
@@ -308,16 +441,13 @@ class SystemMonitorUI:
         scrollbar.pack(side="right", fill="y")
     
     def setup_commands_tab(self):
-        """Setup Commands tab with updated 6 commands"""
+        """Setup Commands tab from the backend command catalog"""
         # Command buttons
         buttons_frame = ttk.LabelFrame(self.commands_tab, text="System Commands", padding=10)
         buttons_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        # Updated commands: removed diskpart and chkdsk, added systeminfo and hostname
-        commands = ['Ping', 'IP Config', 'Task List', 'System Info', 'Hostname', 'Echo Hello']
-        
-        # Create 2 rows of 3 buttons each
-        for i, cmd in enumerate(commands):
+        # Commands available on this OS, 3 buttons per row
+        for i, cmd in enumerate(self.backend.get_commands()):
             row = i // 3
             col = i % 3
             
@@ -329,6 +459,16 @@ class SystemMonitorUI:
         for i in range(3):
             buttons_frame.grid_columnconfigure(i, weight=1)
         
+        # Diagnostic bundles run several commands concurrently
+        bundles = self.backend.get_bundles()
+        if bundles:
+            bundles_frame = ttk.LabelFrame(self.commands_tab, text="Diagnostic Bundles", padding=10)
+            bundles_frame.pack(fill=tk.X, padx=10, pady=5)
+            
+            for bundle in bundles:
+                ttk.Button(bundles_frame, text=bundle,
+                          command=lambda b=bundle: self.run_bundle(b)).pack(side=tk.LEFT, padx=5)
+        
         # Output
         output_frame = ttk.LabelFrame(self.commands_tab, text="Command Output", padding=10)
         output_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -358,54 +498,178 @@ class SystemMonitorUI:
         # Send to backend
         self.backend.command_queue.put(('execute', command))
     
+    def run_bundle(self, bundle):
+        """Run a diagnostic bundle"""
+        self.output_text.insert(tk.END, f"\n> {bundle} (running concurrently)\n")
+        self.output_text.insert(tk.END, "-" * 40 + "\n")
+        self.output_text.see(tk.END)
+        
+        # Send to backend
+        self.backend.command_queue.put(('bundle', bundle))
+    
     def clear_output(self):
         """Clear command output"""
         self.output_text.delete(1.0, tk.END)
     
     def refresh_processes(self):
-        """Refresh process list"""
-        self.processes = self.backend.get_processes()
-        
-        # Clear tree
-        for item in self.process_tree.get_children():
-            self.process_tree.delete(item)
-        
-        # Add processes
-        for proc in self.processes:
-            self.process_tree.insert('', 'end', values=(
+        """Show the latest process table and ask the collector for a fresh one"""
+        self.backend.request_process_refresh()
+        self.update_process_list(*self.backend.query_processes())
+    
+    def schedule_process_filter(self, *args):
+        """Re-filter shortly after the last keystroke"""
+        if self.filter_job:
+            self.root.after_cancel(self.filter_job)
+        self.filter_job = self.root.after(150, self.apply_process_filter)
+    
+    def apply_process_filter(self):
+        """Filter the registry with the filter bar"""
+        self.filter_job = None
+        spec = {
+            'name': self.filter_name_var.get().strip(),
+            'regex': self.filter_regex_var.get(),
+            'user': self.filter_user_var.get().strip(),
+            'status': self.filter_status_var.get().strip(),
+            'min_cpu': self.filter_cpu_var.get().strip(),
+            'min_memory': self.filter_memory_var.get().strip()
+        }
+        try:
+            self.backend.set_process_filter(spec)
+        except (re.error, ValueError) as e:
+            self.filter_error_var.set(f"Invalid filter: {e}")
+            return
+        self.filter_error_var.set("")
+        self.update_process_list(*self.backend.query_processes())
+    
+    def clear_process_filter(self):
+        """Reset the filter bar"""
+        for var in (self.filter_name_var, self.filter_user_var, self.filter_status_var,
+                    self.filter_cpu_var, self.filter_memory_var):
+            var.set("")
+        self.filter_regex_var.set(False)
+    
+    def update_filter_choices(self):
+        """Offer the users and statuses currently in the process table"""
+        users, statuses = self.backend.get_process_choices()
+        self.filter_user_box['values'] = [''] + users
+        self.filter_status_box['values'] = [''] + statuses
+    
+    def update_process_list(self, processes, matched=None, total=None):
+        """Show process rows in place, keeping the selected PIDs selected"""
+        self.processes = processes
+        selected = {self.process_tree.item(item, 'values')[0] for item in self.process_tree.selection()}
+        
+        # Reuse existing rows instead of rebuilding the tree
+        items = self.process_tree.get_children()
+        for i, proc in enumerate(self.processes):
+            values = (
                 proc['pid'],
                 proc['name'],
+                proc.get('user', ''),
                 f"{proc['cpu_percent']:.1f}",
                 f"{proc['memory_percent']:.1f}",
                 proc['status']
-            ))
-        
-        self.status_var.set(f"Processes: {len(self.processes)}")
+            )
+            if i < len(items):
+                item = items[i]
+                self.process_tree.item(item, values=values)
+            else:
+                item = self.process_tree.insert('', 'end', values=values)
+            if str(proc['pid']) in selected:
+                self.process_tree.selection_add(item)
+            else:
+                self.process_tree.selection_remove(item)
+        if len(items) > len(self.processes):
+            self.process_tree.delete(*items[len(self.processes):])
+        
+        if matched is None:
+            self.status_var.set(f"Processes: {len(self.processes)}")
+        else:
+            total = total if total is not None else matched
+            self.status_var.set(f"Processes: showing {len(self.processes)} of {matched} matching ({total} total)")
+    
+    def selected_pids(self):
+        """Get the PIDs of the selected rows"""
+        return [int(self.process_tree.item(item, 'values')[0]) for item in self.process_tree.selection()]
     
     def kill_process(self):
-        """Kill selected process"""
-        selection = self.process_tree.selection()
-        if not selection:
+        """Terminate the selected processes, escalating to kill if they don't exit"""
+        pids = self.selected_pids()
+        if not pids:
             messagebox.showwarning("Warning", "Please select a process")
             return
         
-        item = selection[0]
-        values = self.process_tree.item(item, 'values')
-        pid = int(values[0])
-        name = values[1]
+        if len(pids) == 1:
+            name = self.process_tree.item(self.process_tree.selection()[0], 'values')[1]
+            prompt = f"Kill process {name} (PID: {pids[0]})?"
+        else:
+            prompt = f"Kill {len(pids)} selected processes?"
+        if messagebox.askyesno("Confirm", prompt):
+            self.backend.request_process_action('terminate', {'pids': pids})
+    
+    def request_batch_action(self, selector, target):
+        """Dry run the selection, confirm the matched processes and queue the chosen action"""
+        action = self.action_var.get()
+        value = self.action_value_var.get().strip() or None
+        if action in ('renice', 'affinity') and value is None:
+            messagebox.showwarning("Warning", f"{action} needs a value")
+            return
+        
+        preview = self.backend.preview_process_action(selector, limit=15)
+        if 'error' in preview:
+            messagebox.showerror("Error", preview['error'])
+            return
+        if preview['count'] == 0:
+            messagebox.showinfo("Process Action", f"No processes match {target}")
+            return
         
-        if messagebox.askyesno("Confirm", f"Kill process {name} (PID: {pid})?"):
-            self.backend.command_queue.put(('kill_process', pid))
+        # Show exactly which processes will be hit before asking
+        lines = [f"{row['pid']:>8}  {row['name'][:30]:<30} {row['user']}" for row in preview['rows']]
+        if preview['count'] > len(preview['rows']):
+            lines.append(f"... and {preview['count'] - len(preview['rows'])} more")
+        prompt = (f"{action}{' ' + value if value else ''} {preview['count']} processes ({target})?\n\n"
+                  + "\n".join(lines))
+        if messagebox.askyesno("Confirm", prompt):
+            # Only the confirmed PIDs, and only while they still match the criteria
+            self.backend.request_process_action(action, dict(selector, pids=preview['pids']), value)
+            self.status_var.set(f"Running {action} on {preview['count']} processes...")
+    
+    def apply_to_selected(self):
+        """Apply the batch action to the selected processes"""
+        pids = self.selected_pids()
+        if not pids:
+            messagebox.showwarning("Warning", "Please select a process")
+            return
+        self.request_batch_action({'pids': pids}, f"{len(pids)} selected processes")
+    
+    def apply_to_matching(self):
+        """Apply the batch action to every process matching name, user and cgroup"""
+        selector = {
+            'name': self.match_name_var.get().strip() or None,
+            'user': self.match_user_var.get().strip() or None,
+            'cgroup': self.match_cgroup_var.get().strip() or None
+        }
+        described = ', '.join(f"{key}={val}" for key, val in selector.items() if val)
+        selector['regex'] = self.match_regex_var.get()
+        if not described:
+            messagebox.showwarning("Warning", "Enter a name, user or cgroup to match")
+            return
+        self.request_batch_action(selector, f"all processes matching {described}")
     
     def update_ui(self):
         """Update UI with latest data"""
         # Get data update
         data = self.backend.get_update()
         if data:
-            self.update_cpu_tab(data['cpu'], data['cpu_history'])
-            self.update_memory_tab(data['memory'], data['memory_history'])
+            self.update_cpu_tab(data['cpu'])
+            self.update_memory_tab(data['memory'])
             self.update_disk_tab(data['disk'], data['disk_history'], data['disk_rate'])
-            self.update_network_tab(data['network'], data['network_history'], data['network_rate'])
+            self.update_network_tab(data['network'], data['network_rate'])
+            self.update_anomalies(data)
+            if 'processes' in data:
+                self.update_process_list(data['processes'], data.get('process_count'), data.get('process_total'))
+        
+        self.update_collector_status()
         
         # Get command results
         result = self.backend.get_command_result()
@@ -419,6 +683,20 @@ class SystemMonitorUI:
                     self.output_text.insert(tk.END, f"Error: {data['output']}\n\n")
                 self.output_text.see(tk.END)
             
+            elif result_type == 'bundle_result':
+                self.output_text.insert(tk.END, data['output'] + "\n\n")
+                self.output_text.see(tk.END)
+            
+            elif result_type == 'process_action_result':
+                # Per-PID report goes to the command output; a summary to the status bar
+                self.output_text.insert(tk.END, data['output'] + "\n\n")
+                self.output_text.see(tk.END)
+                summary = data['output'].splitlines()[-1].strip('= ')
+                self.refresh_processes()
+                self.status_var.set(summary)
+                if not data['success']:
+                    messagebox.showwarning("Process Action", f"{summary}\nSee the Commands tab for details")
+            
             elif result_type == 'kill_result':
                 if data['success']:
                     messagebox.showinfo("Success", data['message'])
@@ -426,55 +704,64 @@ class SystemMonitorUI:
                 else:
                     messagebox.showerror("Error", data['message'])
     
-    def update_cpu_tab(self, cpu_data, cpu_history):
+    def update_collector_status(self):
+        """Show how stale the displayed data is"""
+        status = self.backend.get_collector_status()
+        if status['age'] is None:
+            text = f"Collector ({status['mode']}): waiting for data"
+        else:
+            text = f"Collector ({status['mode']}): data age {status['age']:.1f}s"
+        if status['restarts']:
+            text += f" | restarts: {status['restarts']}"
+        if status['error']:
+            text = f"Collector ({status['mode']}): {status['error']}"
+        if text != self.collector_var.get():
+            self.collector_var.set(text)
+            stale = status['error'] or status['age'] is None or status['age'] > 3 * self.backend.update_interval + 1
+            self.collector_label.configure(foreground=self.colors['red'] if stale else self.colors['dark_gray'])
+    
+    def update_anomalies(self, data):
+        """Summarize anomalies in the status bar; charts mark them on refresh"""
+        anomalies = data['anomalies']
+        if anomalies:
+            worst = sorted(anomalies.items(), key=lambda item: abs(item[1]['score']), reverse=True)[:3]
+            text = ", ".join(f"{name} {info['value']:.1f} (expected {info['expected']:.1f})"
+                             for name, info in worst)
+            self.anomaly_var.set(f"Anomaly: {text}")
+            self.anomaly_label.configure(foreground=self.colors['red'])
+        else:
+            self.anomaly_var.set("No anomalies")
+            self.anomaly_label.configure(foreground=self.colors['dark_gray'])
+    
+    def update_cpu_tab(self, cpu_data):
         """Update CPU tab"""
         # Update info
-        info_text = f"CPU Cores: {cpu_data['cpu_count']} | Physical: {cpu_data['physical_cores']} | Frequency: {cpu_data['current_freq']:.0f} MHz"
+        per_cpu_freq = cpu_data['per_cpu_freq'] or [cpu_data['current_freq']]
+        load = cpu_data['load_avg']
+        times = cpu_data['times']
+        rates = cpu_data['rates']
+        info_text = (
+            f"Sockets: {cpu_data['sockets']} | Cores: {cpu_data['physical_cores']} | Threads: {cpu_data['cpu_count']} | "
+            f"Frequency: {sum(per_cpu_freq) / len(per_cpu_freq):.0f} MHz "
+            f"(min {min(per_cpu_freq):.0f}, max {max(per_cpu_freq):.0f})\n"
+            f"Load: {load[0]:.2f} {load[1]:.2f} {load[2]:.2f} | Pressure (avg10): some {cpu_data['pressure']['some']:.2f}% | "
+            f"Steal: {times['steal']:.1f}% | IOwait: {times['iowait']:.1f}% | "
+            f"Switches: {rates['ctx_switches']:.0f}/s | Interrupts: {rates['interrupts']:.0f}/s"
+        )
         self.cpu_info_label.config(text=info_text)
         
         # Update overall usage
         self.cpu_bar['value'] = cpu_data['cpu_percent']
         self.cpu_label.config(text=f"{cpu_data['cpu_percent']:.1f}%")
         
-        # Update per-core usage
-        per_cpu = cpu_data['per_cpu']
+        # Update per-core heatmap
+        self.core_heatmap.update(cpu_data['per_cpu'], cpu_data['per_cpu_freq'])
         
-        # Create core bars if not exist
-        if len(self.cpu_core_bars) != len(per_cpu):
-            # Clear existing
-            for widget in self.cores_frame.winfo_children():
-                widget.destroy()
-            self.cpu_core_bars = []
-            self.cpu_core_labels = []
-            
-            # Create new
-            for i, percent in enumerate(per_cpu):
-                core_frame = ttk.Frame(self.cores_frame)
-                core_frame.pack(fill=tk.X, pady=1)
-                
-                ttk.Label(core_frame, text=f"Core {i}:", width=8).pack(side=tk.LEFT)
-                bar = ttk.Progressbar(core_frame, length=150, mode="determinate", 
-                                     style="Red.Horizontal.TProgressbar")
-                bar.pack(side=tk.LEFT, padx=(5, 10))
-                label = ttk.Label(core_frame, text=f"{percent:.1f}%", width=6)
-                label.pack(side=tk.LEFT)
-                
-                self.cpu_core_bars.append(bar)
-                self.cpu_core_labels.append(label)
-        
-        # Update core bars
-        for i, (bar, label, percent) in enumerate(zip(self.cpu_core_bars, self.cpu_core_labels, per_cpu)):
-            bar['value'] = percent
-            label.config(text=f"{percent:.1f}%")
-        
-        # Update chart
-        time_axis = list(range(len(cpu_history)))
-        self.cpu_line.set_data(time_axis, cpu_history)
-        self.cpu_ax.relim()
-        self.cpu_ax.autoscale_view()
-        self.cpu_canvas.draw_idle()
+        # Update charts
+        for chart in self.cpu_charts:
+            chart.on_tick()
     
-    def update_memory_tab(self, memory_data, memory_history):
+    def update_memory_tab(self, memory_data):
         """Update Memory tab"""
         # Update info
         info_text = f"Total: {memory_data['total_gb']:.1f} GB | Used: {memory_data['used_gb']:.1f} GB | Available: {memory_data['available_gb']:.1f} GB"
@@ -484,12 +771,26 @@ class SystemMonitorUI:
         self.memory_bar['value'] = memory_data['percent']
         self.memory_label.config(text=f"{memory_data['percent']:.1f}%")
         
-        # Update chart
-        time_axis = list(range(len(memory_history)))
-        self.memory_line.set_data(time_axis, memory_history)
-        self.memory_ax.relim()
-        self.memory_ax.autoscale_view()
-        self.memory_canvas.draw_idle()
+        # Update breakdown
+        swap = memory_data['swap']
+        cache = memory_data['cache']
+        rates = memory_data['rates']
+        lines = [
+            f"Swap: {swap['used'] / (1024**3):.1f} / {swap['total'] / (1024**3):.1f} GB ({swap['percent']:.1f}%) | "
+            f"In: {rates['swap_in']:.2f} MB/s | Out: {rates['swap_out']:.2f} MB/s",
+            f"Cached: {cache['cached'] / (1024**3):.2f} GB | Buffers: {cache['buffers'] / (1024**3):.2f} GB | "
+            f"Dirty: {cache['dirty'] / (1024**2):.1f} MB | Writeback: {cache['writeback'] / (1024**2):.1f} MB",
+            f"Pressure (avg10): some {memory_data['pressure']['some']:.2f}% | full {memory_data['pressure']['full']:.2f}% | "
+            f"Major faults: {rates['major_faults']:.1f}/s"
+        ]
+        if memory_data['numa']:
+            lines.append(" | ".join(f"Node {node}: {usage['used'] / (1024**3):.1f} / {usage['total'] / (1024**3):.1f} GB"
+                                    for node, usage in memory_data['numa'].items()))
+        self.memory_detail_label.config(text="\n".join(lines))
+        
+        # Update charts
+        for chart in self.memory_charts:
+            chart.on_tick()
     
     def update_disk_tab(self, disk_data, disk_history, disk_rate):
         """Update Disk tab"""
@@ -533,7 +834,7 @@ class SystemMonitorUI:
             bar['value'] = partition['percent']
             label.config(text=f"{partition['used_gb']:.1f} / {partition['total_gb']:.1f} GB ({partition['percent']:.1f}%)")
     
-    def update_network_tab(self, network_data, network_history, network_rate):
+    def update_network_tab(self, network_data, network_rate):
         """Update Network tab"""
         # Update I/O
         self.network_io_label.config(text=f"Network Rate: {network_rate:.1f} KB/s")
@@ -559,11 +860,7 @@ class SystemMonitorUI:
             self.network_interfaces_created = True
         
         # Update chart
-        time_axis = list(range(len(network_history)))
-        self.network_line.set_data(time_axis, network_history)
-        self.network_ax.relim()
-        self.network_ax.autoscale_view()
-        self.network_canvas.draw_idle()
+        self.network_chart.on_tick()
     
     def start_update_loop(self):
         """Start UI update loop"""
@@ -0,0 +1,201 @@
+import threading
+import numpy as np
+
+ROLLUP_FIELDS = ('timestamp', 'min', 'avg', 'max', 'p95', 'count')
+
+
+class RingBuffer:
+    """Fixed-capacity numpy ring buffer with one array per field"""
+
+    def __init__(self, capacity, fields):
+        self.capacity = capacity
+        self.fields = fields
+        self.data = {field: np.zeros(capacity) for field in fields}
+        self.head = 0  # next write position
+        self.size = 0
+
+    def append(self, **values):
+        """Append one record, overwriting the oldest when full"""
+        for field in self.fields:
+            self.data[field][self.head] = values[field]
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def ordered(self, field):
+        """Get a field in chronological order"""
+        array = self.data[field]
+        if self.size < self.capacity:
+            return array[:self.size]
+        return np.concatenate((array[self.head:], array[:self.head]))
+
+    def between(self, start, end):
+        """Get all fields for records with start <= timestamp < end"""
+        timestamps = self.ordered('timestamp')
+        lo = np.searchsorted(timestamps, start, side='left')
+        hi = np.searchsorted(timestamps, end, side='left')
+        return {field: self.ordered(field)[lo:hi].copy() for field in self.fields}
+
+    def oldest(self):
+        """Get the oldest timestamp, or None when empty"""
+        if self.size == 0:
+            return None
+        return self.data['timestamp'][self.head if self.size == self.capacity else 0]
+
+
+class TieredHistory:
+    """Multi-resolution history for one metric series.
+
+    Raw samples are kept for a short window and rolled up into 1-minute and
+    1-hour min/avg/max/p95 aggregates. All tiers are preallocated ring
+    buffers, so memory stays fixed however long the monitor runs.
+    """
+
+    def __init__(self, raw_size=900, minute_size=2 * 24 * 60, hour_size=30 * 24):
+        self.raw = RingBuffer(raw_size, ('timestamp', 'value'))
+        self.minute = RingBuffer(minute_size, ROLLUP_FIELDS)
+        self.hour = RingBuffer(hour_size, ROLLUP_FIELDS)
+        self.open_minute = None
+        self.open_hour = None
+
+    def append(self, timestamp, value):
+        """Add a raw sample, closing rollup buckets as time moves on"""
+        minute = int(timestamp // 60)
+        if self.open_minute is not None and minute != self.open_minute:
+            self._close_minute(self.open_minute)
+        self.open_minute = minute
+        self.raw.append(timestamp=timestamp, value=value)
+
+    def _close_minute(self, minute):
+        """Aggregate the raw samples of a finished minute"""
+        values = self.raw.between(minute * 60, (minute + 1) * 60)['value']
+        if len(values) == 0:
+            return
+        self.minute.append(timestamp=minute * 60, min=values.min(), avg=values.mean(), max=values.max(),
+                           p95=np.percentile(values, 95), count=len(values))
+
+        hour = minute // 60
+        if self.open_hour is not None and hour != self.open_hour:
+            self._close_hour(self.open_hour)
+        self.open_hour = hour
+
+        # The last minute of an hour completes it; don't wait for the next hour's first minute
+        if (minute + 1) % 60 == 0:
+            self._close_hour(hour)
+            self.open_hour = None
+
+    def _close_hour(self, hour):
+        """Aggregate the minute rollups of a finished hour.
+
+        The hourly p95 is taken over the minute p95 values, which is an
+        approximation since the raw samples are gone by then.
+        """
+        rows = self.minute.between(hour * 3600, (hour + 1) * 3600)
+        counts = rows['count']
+        if len(counts) == 0:
+            return
+        self.hour.append(timestamp=hour * 3600, min=rows['min'].min(),
+                         avg=np.average(rows['avg'], weights=counts), max=rows['max'].max(),
+                         p95=np.percentile(rows['p95'], 95), count=counts.sum())
+
+    def _live_edge(self, name):
+        """Get the records not yet rolled up into a tier.
+
+        For '1m' these are the raw samples of the open minute; for '1h' the
+        closed minutes of the open hour followed by those raw samples.
+        """
+        if self.open_minute is None:
+            return {field: np.array([]) for field in ROLLUP_FIELDS}
+        raw = self.raw.between(self.open_minute * 60, np.inf)
+        values = raw['value']
+        rows = {'timestamp': raw['timestamp'], 'min': values, 'avg': values, 'max': values,
+                'p95': values, 'count': np.ones(len(values))}
+        if name == '1h':
+            hour = self.open_hour if self.open_hour is not None else self.open_minute // 60
+            minutes = self.minute.between(hour * 3600, np.inf)
+            rows = {field: np.concatenate((minutes[field], rows[field])) for field in ROLLUP_FIELDS}
+        return rows
+
+    def query(self, start, end, max_points=None):
+        """Get samples in [start, end) from the finest tier that covers it.
+
+        A tier is skipped if it has already dropped data newer than `start`
+        or would return more than `max_points` records. Rollup tiers end
+        with the finer records of the buckets still open, so the live edge
+        is current. Returns a dict with the tier name, 'timestamp', 'avg',
+        'min', 'max' and 'p95' arrays.
+        """
+        tiers = (('raw', self.raw, 1), ('1m', self.minute, 60), ('1h', self.hour, 3600))
+        for name, tier, resolution in tiers:
+            oldest = tier.oldest()
+            covers = tier.size < tier.capacity or oldest <= start
+            fits = max_points is None or (end - start) / resolution <= max_points
+            if (covers and fits) or name == '1h':
+                break
+
+        if name == 'raw':
+            rows = self.raw.between(start, end)
+            values = rows['value']
+            return {'tier': name, 'timestamp': rows['timestamp'], 'avg': values,
+                    'min': values, 'max': values, 'p95': values}
+
+        rows = tier.between(start, end)
+        edge = self._live_edge(name)
+        keep = (edge['timestamp'] >= start) & (edge['timestamp'] < end)
+        rows = {field: np.concatenate((rows[field], edge[field][keep])) for field in ROLLUP_FIELDS}
+        rows['tier'] = name
+        return rows
+
+
+class HistoryStore:
+    """Thread-safe collection of TieredHistory series keyed by name"""
+
+    def __init__(self, **tier_sizes):
+        self.tier_sizes = tier_sizes
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def record(self, timestamp, values):
+        """Append one tick of {series: value} samples"""
+        with self.lock:
+            for name, value in values.items():
+                history = self.series.get(name)
+                if history is None:
+                    history = self.series[name] = TieredHistory(**self.tier_sizes)
+                history.append(timestamp, value)
+
+    def query(self, name, start, end, max_points=None):
+        """Query one series, or None if it has never been recorded"""
+        with self.lock:
+            history = self.series.get(name)
+            if history is None:
+                return None
+            return history.query(start, end, max_points)
+
+    def names(self):
+        """Get recorded series names"""
+        with self.lock:
+            return list(self.series.keys())
+
+
+def decimate(timestamps, values, buckets, lows=None, highs=None):
+    """Min/max decimation for plotting.
+
+    Splits the series into `buckets` equal-count buckets (one per pixel
+    column) and keeps each bucket's minimum and maximum, so spikes survive
+    while at most 2 * buckets points are drawn. `lows`/`highs` default to
+    `values`; pass the min/max rollup fields for aggregated tiers.
+    """
+    n = len(timestamps)
+    buckets = max(int(buckets), 1)
+    if n <= 2 * buckets:
+        return timestamps, values
+
+    lows = values if lows is None else lows
+    highs = values if highs is None else highs
+    starts = np.unique((np.arange(buckets) * n) // buckets)
+    ends = np.append(starts[1:], n) - 1
+    mins = np.minimum.reduceat(lows, starts)
+    maxs = np.maximum.reduceat(highs, starts)
+    x = np.column_stack((timestamps[starts], timestamps[ends])).ravel()
+    y = np.column_stack((mins, maxs)).ravel()
+    return x, y
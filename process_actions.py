@@ -0,0 +1,214 @@
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import psutil
+import procfs
+
+ACTIONS = ('terminate', 'kill', 'suspend', 'resume', 'renice', 'affinity')
+
+
+def read_cgroup(pid):
+    """Get the cgroup paths of a process, or '' where cgroups are unavailable"""
+    return procfs.read_text(f'/proc/{pid}/cgroup') or ''
+
+
+def select_processes(pids=None, name=None, regex=False, user=None, cgroup=None):
+    """Find processes by PID list, name, user name or cgroup path substring.
+
+    `name` must equal the process name exactly unless `regex` is set, in
+    which case it is searched for as a case-insensitive pattern. Criteria
+    are combined with AND; the monitor's own process is never selected.
+    """
+    pattern = re.compile(name, re.IGNORECASE) if name and regex else None
+    pids = set(pids) if pids is not None else None
+    own_pid = psutil.Process().pid
+
+    selected = []
+    for proc in psutil.process_iter(['pid', 'name', 'username']):
+        try:
+            pinfo = proc.info
+            if pinfo['pid'] == own_pid:
+                continue
+            if pids is not None and pinfo['pid'] not in pids:
+                continue
+            if pattern and not pattern.search(pinfo['name'] or ''):
+                continue
+            if name and not regex and pinfo['name'] != name:
+                continue
+            if user and pinfo['username'] != user:
+                continue
+            if cgroup and cgroup not in read_cgroup(pinfo['pid']):
+                continue
+            selected.append(proc)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return selected
+
+
+class ProcessActions:
+    """Apply an action to many processes in parallel.
+
+    terminate sends SIGTERM to every selected process at once and escalates
+    to SIGKILL for those still alive after `timeout` seconds, so it takes at
+    most twice the timeout however many processes are selected. renice
+    takes a nice value and affinity a CPU list such as '0-3,6'. Every call
+    returns a per-PID report.
+    """
+
+    def __init__(self, max_workers=16, timeout=5.0):
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+    def stop(self, processes, action, timeout=None):
+        """Send terminate or kill to all processes, then wait for them together.
+
+        Survivors of terminate are killed after `timeout` seconds and waited
+        for once more. Returns per-PID results in the order of `processes`.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        results = {}
+        signalled = []
+        for proc in processes:
+            result = results[proc.pid] = {'pid': proc.pid, 'name': proc.info.get('name') or '',
+                                          'success': False}
+            try:
+                if action == 'kill':
+                    proc.kill()
+                else:
+                    proc.terminate()
+                signalled.append(proc)
+            except psutil.NoSuchProcess:
+                result.update(success=True, message='already exited')
+            except psutil.AccessDenied:
+                result['message'] = 'Access denied'
+            except Exception as e:
+                result['message'] = str(e)
+
+        gone, alive = psutil.wait_procs(signalled, timeout)
+        for proc in gone:
+            results[proc.pid].update(success=True, message='killed' if action == 'kill' else 'terminated')
+
+        if action == 'terminate' and alive:
+            for proc in alive:
+                try:
+                    proc.kill()
+                except psutil.NoSuchProcess:
+                    pass
+                except psutil.AccessDenied:
+                    results[proc.pid]['message'] = 'Access denied'
+            gone, alive = psutil.wait_procs(alive, timeout)
+            for proc in gone:
+                results[proc.pid].update(success=True, message=f'killed after {timeout:g}s')
+
+        for proc in alive:
+            results[proc.pid].setdefault('message', f'still running after {timeout:g}s')
+        return [results[proc.pid] for proc in processes]
+
+    def apply(self, proc, action, value=None):
+        """Apply suspend, resume, renice or affinity to one process and report the outcome"""
+        result = {'pid': proc.pid, 'name': '', 'success': False}
+        try:
+            result['name'] = proc.name()
+            if action == 'suspend':
+                proc.suspend()
+                result['message'] = 'suspended'
+            elif action == 'resume':
+                proc.resume()
+                result['message'] = 'resumed'
+            elif action == 'renice':
+                proc.nice(int(value))
+                result['message'] = f'nice {proc.nice()}'
+            elif action == 'affinity':
+                cpus = procfs.parse_cpu_list(str(value))
+                proc.cpu_affinity(cpus)
+                result['message'] = f'affinity {value}'
+            else:
+                result['message'] = f'Unknown action: {action}'
+                return result
+            result['success'] = True
+        except psutil.NoSuchProcess:
+            result['message'] = 'Process not found'
+        except psutil.AccessDenied:
+            result['message'] = 'Access denied'
+        except AttributeError:
+            result['message'] = f'{action} is not supported on this platform'
+        except ValueError as e:
+            result['message'] = f'Invalid value: {e}'
+        except Exception as e:
+            result['message'] = str(e)
+        return result
+
+    @staticmethod
+    def criteria(selector):
+        """Drop empty selector fields; None if nothing would narrow the selection"""
+        criteria = {key: val for key, val in selector.items() if val not in (None, '') and key != 'regex'}
+        if not criteria:
+            return None
+        if criteria.get('name') and selector.get('regex'):
+            criteria['regex'] = True
+        return criteria
+
+    def preview(self, selector, limit=20):
+        """Dry run: get the number of matching processes and the first `limit` of them.
+
+        Returns {'count', 'pids', 'rows': [{'pid', 'name', 'user'}]} or {'error'}.
+        """
+        criteria = self.criteria(selector)
+        if criteria is None:
+            return {'error': 'No selection criteria given'}
+        try:
+            processes = select_processes(**criteria)
+        except re.error as e:
+            return {'error': f'Invalid name pattern: {e}'}
+        rows = [{'pid': proc.pid, 'name': proc.info['name'] or '', 'user': proc.info['username'] or ''}
+                for proc in processes]
+        return {'count': len(rows), 'rows': rows[:limit], 'pids': [row['pid'] for row in rows]}
+
+    def run(self, action, selector, value=None, timeout=None):
+        """Select processes and apply an action to all of them concurrently.
+
+        `selector` holds select_processes() criteria. terminate and kill
+        signal everything first and wait once; other actions run on a
+        thread pool.
+        """
+        if action not in ACTIONS:
+            return {'success': False, 'action': action, 'results': [], 'output': f'Unknown action: {action}'}
+
+        criteria = self.criteria(selector)
+        if criteria is None:
+            # Never fall through to "every process on the machine"
+            return {'success': False, 'action': action, 'results': [], 'output': 'No selection criteria given'}
+
+        start = time.time()
+        try:
+            processes = select_processes(**criteria)
+        except re.error as e:
+            return {'success': False, 'action': action, 'results': [], 'output': f'Invalid name pattern: {e}'}
+
+        results = []
+        if processes and action in ('terminate', 'kill'):
+            results = self.stop(processes, action, timeout)
+        elif processes:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(processes))) as executor:
+                futures = [executor.submit(self.apply, proc, action, value) for proc in processes]
+                results = [future.result() for future in futures]
+        duration = time.time() - start
+
+        failed = [r for r in results if not r['success']]
+        described = ', '.join(f'{len(val)} selected' if key == 'pids' else f'{key}={val}'
+                              for key, val in criteria.items() if key != 'regex')
+        lines = [f"=== {action}{' ' + str(value) if value is not None else ''} on {described} "
+                 f"at {datetime.fromtimestamp(start).strftime('%Y-%m-%d %H:%M:%S')} ==="]
+        for r in results:
+            lines.append(f"{r['pid']:>8} {r['name'][:30]:<30} {'ok' if r['success'] else 'FAILED'}: {r['message']}")
+        lines.append(f"=== {len(results) - len(failed)} of {len(results)} processes succeeded "
+                     f"in {duration:.2f}s ===")
+
+        return {
+            'success': bool(results) and not failed,
+            'action': action,
+            'results': results,
+            'output': '\n'.join(lines),
+            'duration': duration
+        }
@@ -0,0 +1,217 @@
+import re
+import threading
+import numpy as np
+import psutil
+
+FILTER_FIELDS = ('name', 'regex', 'user', 'status', 'min_cpu', 'min_memory')
+
+
+class ProcessFilter:
+    """Process filter: name substring or regex, user, status and CPU/memory thresholds.
+
+    Empty fields match everything. Raises re.error for a bad regex.
+    """
+
+    def __init__(self, name=None, regex=False, user=None, status=None, min_cpu=None, min_memory=None):
+        self.name = name or None
+        self.regex = regex
+        self.user = user or None
+        self.status = status or None
+        self.min_cpu = float(min_cpu) if min_cpu not in (None, '') else None
+        self.min_memory = float(min_memory) if min_memory not in (None, '') else None
+        if self.name is None:
+            self.pattern = None
+        elif regex:
+            self.pattern = re.compile(self.name, re.IGNORECASE)
+        else:
+            self.pattern = re.compile(re.escape(self.name), re.IGNORECASE)
+
+    @classmethod
+    def from_dict(cls, spec):
+        """Build from a dict of FILTER_FIELDS, ignoring unknown keys"""
+        return cls(**{key: spec[key] for key in FILTER_FIELDS if key in (spec or {})})
+
+    def is_empty(self):
+        return (self.pattern is None and self.user is None and self.status is None
+                and self.min_cpu is None and self.min_memory is None)
+
+    def narrows(self, other):
+        """Check whether every process passing our name/user/status criteria also passes other's.
+
+        Only then are the CPU and memory numbers measured under `other` still
+        current for everything this filter can show.
+        """
+        if other.user is not None and self.user != other.user:
+            return False
+        if other.status is not None and self.status != other.status:
+            return False
+        if other.pattern is None:
+            return True
+        if self.pattern is None or self.regex or other.regex:
+            return self.pattern is not None and self.regex == other.regex and self.name == other.name
+        # A longer substring containing the old one can only match fewer names
+        return other.name.lower() in self.name.lower()
+
+    def matches_identity(self, name, user, status):
+        """Check the name, user and status criteria, which are cheap to read before the rest"""
+        return ((self.pattern is None or bool(self.pattern.search(name)))
+                and (self.user is None or user == self.user)
+                and (self.status is None or status == self.status))
+
+
+class ProcessRegistry:
+    """Latest process table kept as columns, indexed for fast filtering.
+
+    Names, users and statuses are stored as codes into their distinct
+    values, so a text filter is evaluated once per distinct value and
+    then broadcast to all rows with a lookup. Filtering 10k processes is
+    a few numpy operations and never touches psutil.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timestamp = None
+        self.complete = False  # every row measured in the latest scan
+        self.columns = self._index([])
+        self.user_names = {}
+
+    def resolve_user(self, uid):
+        """Get a user name for a uid, cached because pwd lookups are per call in psutil"""
+        if uid not in self.user_names:
+            try:
+                import pwd
+                self.user_names[uid] = pwd.getpwuid(uid).pw_name
+            except (ImportError, KeyError):
+                self.user_names[uid] = str(uid)
+        return self.user_names[uid]
+
+    @staticmethod
+    def _codes(values):
+        """Split a string column into (distinct values, per-row codes)"""
+        distinct, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+        return distinct, codes.reshape(-1)
+
+    def _index(self, rows):
+        names, name_codes = self._codes([row['name'] for row in rows])
+        users, user_codes = self._codes([row['user'] for row in rows])
+        statuses, status_codes = self._codes([row['status'] for row in rows])
+        return {
+            'rows': rows,
+            'by_pid': {row['pid']: row for row in rows},
+            'cpu': np.array([row['cpu_percent'] for row in rows], dtype=np.float64),
+            'memory': np.array([row['memory_percent'] for row in rows], dtype=np.float64),
+            'names': names, 'name_codes': name_codes,
+            'users': users, 'user_codes': user_codes,
+            'statuses': statuses, 'status_codes': status_codes
+        }
+
+    def update(self, rows, timestamp=None):
+        """Replace the table with freshly collected rows and rebuild the index"""
+        rows = list(rows)
+        columns = self._index(rows)
+        with self.lock:
+            self.columns = columns
+            self.timestamp = timestamp
+            self.complete = all(row.get('measured', True) for row in rows)
+
+    def __len__(self):
+        return len(self.columns['rows'])
+
+    def get(self, pid):
+        """Get the latest row for a PID, or None"""
+        return self.columns['by_pid'].get(pid)
+
+    def get_users(self):
+        """Get distinct user names in the table"""
+        return self.columns['users'].tolist()
+
+    def get_statuses(self):
+        """Get distinct process statuses in the table"""
+        return self.columns['statuses'].tolist()
+
+    @staticmethod
+    def _equals(distinct, codes, value):
+        """Row mask for a coded column equal to value"""
+        i = np.searchsorted(distinct, value)
+        if i < len(distinct) and distinct[i] == value:
+            return codes == i
+        return np.zeros(len(codes), dtype=bool)
+
+    def query(self, process_filter=None, limit=100, sort_by='cpu'):
+        """Get (match_count, rows) for rows passing the filter, busiest first"""
+        with self.lock:
+            columns = self.columns
+        mask = np.ones(len(columns['rows']), dtype=bool)
+
+        f = process_filter
+        if f is not None and not f.is_empty():
+            if f.pattern is not None:
+                # One regex test per distinct name, broadcast to rows through the codes
+                hits = np.array([bool(f.pattern.search(name)) for name in columns['names']], dtype=bool)
+                mask &= hits[columns['name_codes']]
+            if f.user is not None:
+                mask &= self._equals(columns['users'], columns['user_codes'], f.user)
+            if f.status is not None:
+                mask &= self._equals(columns['statuses'], columns['status_codes'], f.status)
+            if f.min_cpu is not None:
+                mask &= columns['cpu'] >= f.min_cpu
+            if f.min_memory is not None:
+                mask &= columns['memory'] >= f.min_memory
+
+        matches = np.flatnonzero(mask)
+        key = columns['memory' if sort_by == 'memory' else 'cpu'][matches]
+        order = matches[np.argsort(-key, kind='stable')][:limit]
+        return len(matches), [columns['rows'][i] for i in order]
+
+
+# uids are cheap to read and resolve through a cache; Windows only has username
+USER_ATTR = 'uids' if hasattr(psutil.Process, 'uids') else 'username'
+
+
+def collect_processes(registry, process_filter=None):
+    """Read the process table from psutil into registry rows.
+
+    Name, user and status are read for every process. CPU and memory are
+    only measured for processes passing the filter's name/user/status
+    criteria; the rest keep their previous numbers so the registry can
+    still answer a changed filter straight away. Rows record whether they
+    were measured in this scan.
+    """
+    rows = []
+    for proc in psutil.process_iter(['pid', 'name', 'status', USER_ATTR]):
+        try:
+            pinfo = proc.info
+            if USER_ATTR == 'uids':
+                user = registry.resolve_user(pinfo['uids'].real) if pinfo['uids'] else ''
+            else:
+                user = pinfo['username'] or ''
+            row = {
+                'pid': pinfo['pid'],
+                'name': (pinfo['name'] or '')[:40],
+                'cpu_percent': 0,
+                'memory_percent': 0,
+                'rss': 0,
+                'status': pinfo['status'] or '',
+                'user': user,
+                'measured': False
+            }
+
+            if process_filter is None or process_filter.matches_identity(row['name'], user, row['status']):
+                row['measured'] = True
+                try:
+                    with proc.oneshot():
+                        row['cpu_percent'] = proc.cpu_percent()
+                        row['rss'] = proc.memory_info().rss
+                        row['memory_percent'] = proc.memory_percent()
+                except psutil.AccessDenied:
+                    # Identity is still useful for filtering even when usage can't be read
+                    pass
+            else:
+                previous = registry.get(row['pid'])
+                if previous is not None and previous['name'] == row['name']:
+                    for field in ('cpu_percent', 'memory_percent', 'rss'):
+                        row[field] = previous[field]
+            rows.append(row)
+        except psutil.NoSuchProcess:
+            pass
+    return rows
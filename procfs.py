@@ -0,0 +1,140 @@
+import glob
+import re
+
+# Readers for Linux /proc and /sys files that psutil doesn't expose.
+# Every reader returns an empty result when the file is missing, so
+# callers work unchanged on other platforms and older kernels.
+
+
+def read_key_values(path, scale=1):
+    """Read a 'key value [unit]' file such as /proc/meminfo or /proc/vmstat"""
+    values = {}
+    try:
+        with open(path, 'r') as f:
+            for line in f:
+                parts = line.replace(':', ' ').split()
+                if len(parts) >= 2:
+                    try:
+                        values[parts[0]] = int(parts[1]) * scale
+                    except ValueError:
+                        pass
+    except OSError:
+        pass
+    return values
+
+
+def read_meminfo():
+    """Read /proc/meminfo in bytes"""
+    return read_key_values('/proc/meminfo', 1024)
+
+
+def read_vmstat():
+    """Read /proc/vmstat counters"""
+    return read_key_values('/proc/vmstat')
+
+
+def read_pressure(resource):
+    """Read PSI for 'cpu', 'memory' or 'io' from /proc/pressure.
+
+    Returns {'some': {'avg10', 'avg60', 'avg300', 'total'}, 'full': {...}}.
+    """
+    pressure = {}
+    try:
+        with open(f'/proc/pressure/{resource}', 'r') as f:
+            for line in f:
+                kind, *fields = line.split()
+                pressure[kind] = {key: float(value) for key, value in (field.split('=') for field in fields)}
+    except (OSError, ValueError):
+        pass
+    return pressure
+
+
+def numa_nodes():
+    """Get NUMA node ids present on this host"""
+    nodes = []
+    for path in glob.glob('/sys/devices/system/node/node[0-9]*'):
+        nodes.append(int(re.search(r'node(\d+)$', path).group(1)))
+    return sorted(nodes)
+
+
+def read_numa_meminfo():
+    """Read per-NUMA-node memory usage in bytes"""
+    nodes = {}
+    for node in numa_nodes():
+        path = f'/sys/devices/system/node/node{node}/meminfo'
+        values = {}
+        # Lines look like 'Node 0 MemTotal:       16318588 kB'
+        try:
+            with open(path, 'r') as f:
+                for line in f:
+                    parts = line.replace(':', ' ').split()
+                    if len(parts) >= 4:
+                        values[parts[2]] = int(parts[3]) * 1024
+        except (OSError, ValueError):
+            continue
+
+        total = values.get('MemTotal', 0)
+        free = values.get('MemFree', 0)
+        nodes[node] = {
+            'total': total,
+            'free': free,
+            'used': total - free,
+            'percent': (total - free) / total * 100 if total else 0
+        }
+    return nodes
+
+
+def parse_cpu_list(text):
+    """Parse a kernel CPU list such as '0-3,8,10-11'"""
+    cpus = []
+    for part in text.strip().split(','):
+        if '-' in part:
+            lo, hi = part.split('-')
+            cpus.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            cpus.append(int(part))
+    return cpus
+
+
+def read_text(path):
+    """Read a small sysfs file, or None if it is missing"""
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def read_cpu_topology():
+    """Read sockets, cores, SMT sibling groups and NUMA CPU lists from sysfs.
+
+    Returns an empty dict when sysfs topology is unavailable.
+    """
+    packages = set()
+    cores = set()
+    siblings = set()
+    for path in glob.glob('/sys/devices/system/cpu/cpu[0-9]*/topology'):
+        package = read_text(f'{path}/physical_package_id')
+        core = read_text(f'{path}/core_id')
+        thread_siblings = read_text(f'{path}/thread_siblings_list')
+        if package is None or core is None:
+            continue
+        packages.add(package)
+        cores.add((package, core))
+        if thread_siblings:
+            siblings.add(tuple(parse_cpu_list(thread_siblings)))
+
+    if not packages:
+        return {}
+
+    numa = {}
+    for node in numa_nodes():
+        cpulist = read_text(f'/sys/devices/system/node/node{node}/cpulist')
+        numa[node] = parse_cpu_list(cpulist) if cpulist else []
+
+    return {
+        'sockets': len(packages),
+        'cores': len(cores),
+        'smt_siblings': sorted(siblings),
+        'numa': numa
+    }
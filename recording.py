@@ -0,0 +1,279 @@
+import csv
+import json
+import os
+import numpy as np
+
+PROCESS_FIELDS = ('pid', 'name', 'cpu_percent', 'memory_percent', 'rss')
+
+FORMATS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.json': 'jsonl',
+    '.npz': 'npz',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow'
+}
+
+
+def detect_format(path):
+    """Guess a recording format from the file extension"""
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Unknown recording format for {path}; use one of {', '.join(sorted(set(FORMATS.values())))}")
+    return fmt
+
+
+def processes_path(path):
+    """Sibling file holding the process table for table formats (csv, parquet, arrow)"""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.processes{ext}"
+
+
+def import_pyarrow():
+    """Import pyarrow, which is only needed for Parquet/Arrow files"""
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        raise ImportError("Parquet/Arrow support requires pyarrow (pip install pyarrow)")
+
+
+class Recording:
+    """Columnar recording of monitor samples.
+
+    Metrics are one float column per series aligned with `timestamps`
+    (NaN where a series was absent). Process snapshots are a flat table
+    with one row per process per snapshot. Queries run as numpy scans
+    over these columns.
+    """
+
+    def __init__(self, timestamps=(), metrics=None, processes=None):
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.metrics = {name: np.asarray(values, dtype=np.float64) for name, values in (metrics or {}).items()}
+        processes = processes or {}
+        self.processes = {
+            'timestamp': np.asarray(processes.get('timestamp', ()), dtype=np.float64),
+            'pid': np.asarray(processes.get('pid', ()), dtype=np.int64),
+            'name': np.asarray(processes.get('name', ()), dtype=str),
+            'cpu_percent': np.asarray(processes.get('cpu_percent', ()), dtype=np.float64),
+            'memory_percent': np.asarray(processes.get('memory_percent', ()), dtype=np.float64),
+            'rss': np.asarray(processes.get('rss', ()), dtype=np.float64)
+        }
+        self._sort()
+
+    def _sort(self):
+        """Keep both tables in timestamp order"""
+        if len(self.timestamps) and np.any(np.diff(self.timestamps) < 0):
+            order = np.argsort(self.timestamps, kind='stable')
+            self.timestamps = self.timestamps[order]
+            self.metrics = {name: values[order] for name, values in self.metrics.items()}
+        times = self.processes['timestamp']
+        if len(times) and np.any(np.diff(times) < 0):
+            order = np.argsort(times, kind='stable')
+            self.processes = {field: values[order] for field, values in self.processes.items()}
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from {'timestamp', 'metrics', 'processes'?} rows"""
+        rows = list(rows)
+        names = list(dict.fromkeys(name for row in rows for name in row['metrics']))
+        metrics = {name: [row['metrics'].get(name, np.nan) for row in rows] for name in names}
+
+        processes = {field: [] for field in ('timestamp',) + PROCESS_FIELDS}
+        for row in rows:
+            for proc in row.get('processes') or ():
+                processes['timestamp'].append(row['timestamp'])
+                for field in PROCESS_FIELDS:
+                    processes[field].append(proc.get(field, 0))
+
+        return cls([row['timestamp'] for row in rows], metrics, processes)
+
+    def rows(self):
+        """Iterate {'timestamp', 'metrics', 'processes'?} rows"""
+        proc_times = self.processes['timestamp']
+        for i, timestamp in enumerate(self.timestamps):
+            row = {
+                'timestamp': float(timestamp),
+                'metrics': {name: float(values[i]) for name, values in self.metrics.items()
+                            if not np.isnan(values[i])}
+            }
+            lo, hi = np.searchsorted(proc_times, timestamp, 'left'), np.searchsorted(proc_times, timestamp, 'right')
+            if hi > lo:
+                row['processes'] = [
+                    {field: self.processes[field][j].item() for field in PROCESS_FIELDS} for j in range(lo, hi)
+                ]
+            yield row
+
+    def between(self, start=None, end=None):
+        """Get a new recording restricted to [start, end)"""
+        start = -np.inf if start is None else start
+        end = np.inf if end is None else end
+        lo, hi = np.searchsorted(self.timestamps, start, 'left'), np.searchsorted(self.timestamps, end, 'left')
+        times = self.processes['timestamp']
+        plo, phi = np.searchsorted(times, start, 'left'), np.searchsorted(times, end, 'left')
+        return Recording(self.timestamps[lo:hi], {name: values[lo:hi] for name, values in self.metrics.items()},
+                         {field: values[plo:phi] for field, values in self.processes.items()})
+
+    # Writers
+
+    def save(self, path, fmt=None):
+        """Write the recording; table formats put processes in a sibling file"""
+        fmt = fmt or detect_format(path)
+        if fmt == 'jsonl':
+            with open(path, 'w', encoding='utf-8') as f:
+                for row in self.rows():
+                    f.write(json.dumps(row) + '\n')
+        elif fmt == 'csv':
+            self._save_csv(path)
+        elif fmt == 'npz':
+            arrays = {'timestamp': self.timestamps}
+            arrays.update({f'metric/{name}': values for name, values in self.metrics.items()})
+            arrays.update({f'process/{field}': values for field, values in self.processes.items()})
+            with open(path, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+        elif fmt in ('parquet', 'arrow'):
+            self._save_arrow(path, fmt)
+        else:
+            raise ValueError(f"Unknown format: {fmt}")
+
+    def write_csv(self, f):
+        """Write the metric columns as CSV to an open file"""
+        names = list(self.metrics)
+        writer = csv.writer(f)
+        writer.writerow(['timestamp'] + names)
+        columns = np.column_stack([self.timestamps] + [self.metrics[name] for name in names])
+        writer.writerows(columns.tolist())
+
+    def _save_csv(self, path):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            self.write_csv(f)
+
+        if len(self.processes['timestamp']):
+            fields = ('timestamp',) + PROCESS_FIELDS
+            with open(processes_path(path), 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(fields)
+                writer.writerows(zip(*(self.processes[field].tolist() for field in fields)))
+
+    def _save_arrow(self, path, fmt):
+        pa = import_pyarrow()
+        write = pa.parquet.write_table if fmt == 'parquet' else pa.feather.write_feather
+        metrics = {'timestamp': self.timestamps}
+        metrics.update(self.metrics)
+        write(pa.table(metrics), path)
+        if len(self.processes['timestamp']):
+            write(pa.table(self.processes), processes_path(path))
+
+    # Readers
+
+    @classmethod
+    def load(cls, path, fmt=None):
+        """Read a recording written by save()"""
+        fmt = fmt or detect_format(path)
+        if fmt == 'jsonl':
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls.from_rows(json.loads(line) for line in f if line.strip())
+        if fmt == 'csv':
+            return cls._load_csv(path)
+        if fmt == 'npz':
+            with np.load(path) as data:
+                metrics = {key[len('metric/'):]: data[key] for key in data.files if key.startswith('metric/')}
+                processes = {key[len('process/'):]: data[key] for key in data.files if key.startswith('process/')}
+                return cls(data['timestamp'], metrics, processes)
+        if fmt in ('parquet', 'arrow'):
+            return cls._load_arrow(path, fmt)
+        raise ValueError(f"Unknown format: {fmt}")
+
+    @classmethod
+    def _load_csv(cls, path):
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            columns = np.array([[float(v) if v else np.nan for v in row] for row in reader]).reshape(-1, len(header))
+        metrics = {name: columns[:, i] for i, name in enumerate(header) if name != 'timestamp'}
+
+        processes = {}
+        if os.path.exists(processes_path(path)):
+            with open(processes_path(path), 'r', newline='', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                fields = next(reader)
+                values = list(zip(*reader)) or [()] * len(fields)
+                processes = dict(zip(fields, values))
+        return cls(columns[:, header.index('timestamp')], metrics, processes)
+
+    @classmethod
+    def _load_arrow(cls, path, fmt):
+        pa = import_pyarrow()
+        read = pa.parquet.read_table if fmt == 'parquet' else pa.feather.read_table
+        table = read(path)
+        metrics = {name: table.column(name).to_numpy() for name in table.column_names if name != 'timestamp'}
+
+        processes = {}
+        if os.path.exists(processes_path(path)):
+            proc_table = read(processes_path(path))
+            processes = {name: proc_table.column(name).to_numpy(zero_copy_only=False)
+                         for name in proc_table.column_names}
+        return cls(table.column('timestamp').to_numpy(), metrics, processes)
+
+    # Queries
+
+    def window_aggregate(self, metric, agg='max', window=300, start=None, end=None):
+        """Aggregate a metric per window over [start, end).
+
+        Windows are aligned to multiples of `window` seconds. `agg` is one
+        of max, min, avg, p95 or count. Returns (window_starts, values).
+        """
+        if metric not in self.metrics:
+            raise KeyError(f"Unknown metric: {metric}")
+
+        times = self.timestamps
+        values = self.metrics[metric]
+        start = -np.inf if start is None else start
+        end = np.inf if end is None else end
+        lo, hi = np.searchsorted(times, start, 'left'), np.searchsorted(times, end, 'left')
+        times, values = times[lo:hi], values[lo:hi]
+        keep = ~np.isnan(values)
+        times, values = times[keep], values[keep]
+        if len(times) == 0:
+            return np.array([]), np.array([])
+
+        buckets = (times // window).astype(np.int64)
+        edges = np.flatnonzero(np.diff(buckets)) + 1
+        starts = np.concatenate(([0], edges))
+        counts = np.diff(np.append(starts, len(values)))
+
+        if agg == 'max':
+            result = np.maximum.reduceat(values, starts)
+        elif agg == 'min':
+            result = np.minimum.reduceat(values, starts)
+        elif agg == 'avg':
+            result = np.add.reduceat(values, starts) / counts
+        elif agg == 'count':
+            result = counts.astype(np.float64)
+        elif agg == 'p95':
+            result = np.array([np.percentile(chunk, 95) for chunk in np.split(values, edges)])
+        else:
+            raise ValueError(f"Unknown aggregate: {agg}")
+
+        return buckets[starts] * float(window), result
+
+    def top_processes(self, at=None, by='rss', limit=10):
+        """Get the top processes by a field in the last snapshot at or before `at`.
+
+        Returns (snapshot_time, rows) or (None, []) if no snapshot qualifies.
+        """
+        times = self.processes['timestamp']
+        if by not in ('cpu_percent', 'memory_percent', 'rss'):
+            raise ValueError(f"Cannot rank processes by {by}")
+        end = len(times) if at is None else np.searchsorted(times, at, 'right')
+        if end == 0:
+            return None, []
+
+        snapshot = times[end - 1]
+        lo = np.searchsorted(times, snapshot, 'left')
+        order = lo + np.argsort(-self.processes[by][lo:end], kind='stable')[:limit]
+        rows = [{field: self.processes[field][i].item() for field in PROCESS_FIELDS} for i in order]
+        return float(snapshot), rows